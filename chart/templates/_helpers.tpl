@@ -196,6 +196,8 @@ Used by dns-init and dns-watcher containers
   value: {{ .Values.mail.domains | toJson | quote }}
 - name: DNS_TTL
   value: {{ .Values.dns.ttl | quote }}
+- name: DNS_CONCURRENCY
+  value: {{ .Values.dns.concurrency | quote }}
 - name: DNS_CREATE_A
   value: {{ .Values.dns.records.a | quote }}
 - name: DNS_CREATE_MX
@@ -18,20 +18,31 @@ import sys
 import threading
 from types import FrameType
 
-from dnsbl import BlacklistConfig, BlacklistMonitor
-
 # Shutdown event
 shutdown_event = threading.Event()
 
 
 def signal_handler(signum: int, frame: FrameType | None) -> None:
-    """Handle termination signals."""
+    """Handle termination signals.
+
+    The first signal requests a graceful shutdown. A repeated signal exits
+    immediately instead of waiting for in-flight DNS queries to time out.
+    """
+    if shutdown_event.is_set():
+        logging.warning(f"Received signal {signum} again, exiting immediately")
+        os._exit(128 + signum)
+
     logging.info(f"Received signal {signum}, initiating shutdown...")
     shutdown_event.set()
 
 
 def setup_logging(verbose: bool = False) -> None:
     """Configure logging."""
+    # The format uses none of these; skip collecting them on every record
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
     logging.basicConfig(
         level=logging.DEBUG if verbose else logging.INFO,
         format="%(asctime)s [%(levelname)s] %(message)s",
@@ -39,28 +50,43 @@ def setup_logging(verbose: bool = False) -> None:
     )
 
 
-def parse_args() -> argparse.Namespace:
-    """Parse command line arguments."""
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser.
+
+    Options left unset default to None so BlacklistConfig.from_env() stays
+    the single source of environment defaults.
+    """
     parser = argparse.ArgumentParser(description="Blacklist Monitor for Mail Relay")
 
     parser.add_argument(
         "--interval",
         type=int,
-        default=int(os.environ.get("BLACKLIST_INTERVAL", "3600")),
+        default=None,
         help="Check interval in seconds (default: 3600)",
     )
     parser.add_argument(
         "--metrics-port",
         type=int,
-        default=int(os.environ.get("BLACKLIST_METRICS_PORT", "8095")),
+        default=None,
         help="Prometheus metrics port (default: 8095)",
     )
     parser.add_argument(
         "--shared-dir",
         type=str,
-        default=os.environ.get("SHARED_DIR", "/shared"),
+        default=None,
         help="Shared volume directory (default: /shared)",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Maximum DNSBL queries in flight (default: 128)",
+    )
+    parser.add_argument(
+        "--free-only",
+        action="store_true",
+        help="Only check DNSBLs that work with public resolvers",
+    )
     parser.add_argument(
         "-v",
         "--verbose",
@@ -87,11 +113,20 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--dns-server",
         type=str,
-        default=os.environ.get("BLACKLIST_DNS_SERVER", ""),
-        help="Custom DNS server IP (optional)",
+        default=None,
+        help="Custom DNS server IP(s), comma-separated (optional)",
     )
 
-    return parser.parse_args()
+    return parser
+
+
+# Built once at import
+_PARSER = _build_parser()
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    return _PARSER.parse_args()
 
 
 def main() -> None:
@@ -100,31 +135,36 @@ def main() -> None:
 
     setup_logging(args.verbose)
 
+    # Imported here so --help and argument errors skip plugin/dnspython loading
+    from dnsbl import BlacklistConfig, BlacklistMonitor
+    from dnsbl.config import split_csv
+
     # Register signal handlers
     signal.signal(signal.SIGTERM, signal_handler)
     signal.signal(signal.SIGINT, signal_handler)
 
     # Load config
     config = BlacklistConfig.from_env()
-    config.interval = args.interval
-    config.metrics_port = args.metrics_port
-    config.shared_dir = args.shared_dir
+    if args.interval is not None:
+        config.interval = args.interval
+    if args.metrics_port is not None:
+        config.metrics_port = args.metrics_port
+    if args.shared_dir is not None:
+        config.shared_dir = args.shared_dir
+    if args.concurrency is not None:
+        config.concurrency = max(1, args.concurrency)
     if args.dns_server:
         config.dns_server = args.dns_server
+    if args.free_only:
+        config.free_only = True
 
     # Create monitor
     monitor = BlacklistMonitor(config, shutdown_event)
 
     # Check-once mode
     if args.check_once:
-        ips = (
-            [ip.strip() for ip in args.ips.split(",") if ip.strip()] if args.ips else []
-        )
-        domains = (
-            [d.strip() for d in args.domains.split(",") if d.strip()]
-            if args.domains
-            else config.domains
-        )
+        ips = split_csv(args.ips)
+        domains = split_csv(args.domains) or config.domains
 
         if not ips and not domains:
             logging.error("No IPs or domains to check. Use --ips and/or --domains")
@@ -17,17 +17,32 @@ import argparse
 import json
 import logging
 import os
+import socket
 import sys
 import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
-# Add scripts directory to path
-sys.path.insert(0, str(Path(__file__).parent))
+# Try to import dnspython (needed to verify DKIM records)
+try:
+    import dns.exception
+    import dns.resolver
 
-from dns_providers.base import DNSProvider, DNSRecord, RecordType
+    HAS_DNSPYTHON = True
+except ImportError:
+    dns = None  # type: ignore[assignment]
+    HAS_DNSPYTHON = False
+
+if TYPE_CHECKING:
+    from dns.resolver import Resolver
+
+from dns_providers.base import DNSProvider, DNSRecord, RecordType, ZoneRecordCache
 from dns_providers.registry import get_provider_from_env
+from utils.files import write_atomic
 from utils.ip import IPDetector, IPDetectorConfig
 from utils.k8s import KubernetesClient, KubernetesConfig
 
@@ -73,6 +88,9 @@ class MailConfig:
     # TTL
     ttl: int = 300
 
+    # Domains provisioned in parallel (bounded to stay under API rate limits)
+    concurrency: int = 4
+
     @classmethod
     def from_env(cls) -> "MailConfig":
         """Create config from environment variables"""
@@ -100,6 +118,7 @@ class MailConfig:
             dmarc_pct=os.environ.get("DNS_DMARC_PCT", ""),
             dmarc_rua=os.environ.get("DNS_DMARC_RUA", ""),
             ttl=int(os.environ.get("DNS_TTL", "300")),
+            concurrency=max(1, int(os.environ.get("DNS_CONCURRENCY", "4"))),
         )
 
 
@@ -116,6 +135,10 @@ class DNSManager:
     - PTR record for mail server IP (via provider like Hetzner)
     """
 
+    # DKIM secrets are re-read after this many seconds, so a watcher check
+    # and the update it triggers share one read but later checks see rotations
+    DKIM_CACHE_TTL = 30.0
+
     def __init__(
         self,
         provider: DNSProvider,
@@ -134,9 +157,15 @@ class DNSManager:
         # Cache zone IDs
         self._zone_cache: dict[str, str] = {}
 
+        # DKIM records from secrets: domain -> (monotonic read time, record)
+        self._dkim_cache: dict[str, tuple[float, Optional[str]]] = {}
+
         # PTR provider (initialized on demand)
         self._ptr_provider: Optional[DNSProvider] = None
 
+        # IPs detected by the last init_or_update: (incoming, outbound, all)
+        self.detected_ips: Optional[tuple[str, Optional[str], list[str]]] = None
+
     def _get_ptr_provider(self) -> Optional[DNSProvider]:
         """Get PTR provider (lazy initialization)"""
         if self._ptr_provider is None and self.ptr_config.enabled:
@@ -200,17 +229,49 @@ class DNSManager:
                 self._zone_cache[domain] = zone_id
         return self._zone_cache.get(domain)
 
-    def _extract_domain(self, fqdn: str) -> str:
-        """Extract base domain from FQDN (e.g., mail.example.com -> example.com)"""
-        parts = fqdn.split(".")
-        if len(parts) >= 2:
-            return ".".join(parts[-2:])
-        return fqdn
+    def _prefetch_zones(self, include_hostname: bool = False) -> None:
+        """
+        Resolve zone IDs for all configured domains up front.
+
+        The first lookup runs alone, so a provider that lists all its zones
+        on first use (Cloudflare) does that once; the rest run concurrently.
+
+        Args:
+            include_hostname: Also resolve the mail hostname's zone
+        """
+        domains = [d["name"] for d in self.mail_config.domains]
+        if include_hostname:
+            domains.insert(0, self.mail_config.hostname)
+
+        pending = [d for d in dict.fromkeys(domains) if d not in self._zone_cache]
+        if not pending:
+            return
+
+        self._get_zone_id(pending[0])
+
+        rest = pending[1:]
+        if rest:
+            workers = min(self.mail_config.concurrency, len(rest))
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="dns"
+            ) as executor:
+                list(executor.map(self._get_zone_id, rest))
+
+    def _get_dkim_record(self, domain: str) -> Optional[str]:
+        """Get DKIM record from its Kubernetes secret, cached for DKIM_CACHE_TTL"""
+        now = time.monotonic()
+        cached = self._dkim_cache.get(domain)
+        if cached and now - cached[0] < self.DKIM_CACHE_TTL:
+            return cached[1]
+
+        record = self.k8s.get_dkim_record(domain)
+        self._dkim_cache[domain] = (now, record)
+        return record
 
     def build_spf_record(self, ips: list[str]) -> str:
         """Build SPF record content"""
         # Sort IPs to ensure consistent record content regardless of detection order
-        ip_parts = " ".join(f"ip4:{ip}" for ip in sorted(ips))
+        ip_parts = " ".join(["ip4:" + ip for ip in sorted(ips)])
         return f"v=spf1 {ip_parts} {self.mail_config.spf_policy}"
 
     def build_dmarc_record(self, domain: str) -> str:
@@ -256,6 +317,7 @@ class DNSManager:
 
         outbound_ip = self.ip_detector.detect_outbound_ip()
         all_ips = self.ip_detector.get_all_ips(self.k8s, wait_for_lb)
+        self.detected_ips = (incoming_ip, outbound_ip, all_ips)
 
         self.logger.info(f"Incoming IP:  {incoming_ip}")
         self.logger.info(f"Outbound IP:  {outbound_ip}")
@@ -267,45 +329,54 @@ class DNSManager:
         self.logger.info(f"Owner ID:     {self.provider.owner_id}")
         self.logger.info("")
 
+        self._prefetch_zones(include_hostname=self.mail_config.create_a)
+
         success = True
 
+        # Every record set below is independent and bound by API round
+        # trips, so they are provisioned in parallel: the A record, each
+        # domain's records, and the PTR record (separate provider)
+        tasks: list[Callable[[], bool]] = []
+
         # A record for mail hostname
         if self.mail_config.create_a:
-            success &= self._ensure_a_record(incoming_ip)
+            tasks.append(partial(self._ensure_a_record, incoming_ip))
 
-        # Per-domain records
+        # Per-domain records; SPF content is the same for every domain
+        spf_content = self.build_spf_record(all_ips)
         for domain_cfg in self.mail_config.domains:
             domain = domain_cfg["name"]
             selector = domain_cfg.get("dkimSelector", "mail")
 
-            self.logger.info(f"\n--- Domain: {domain} (selector: {selector}) ---")
-
             zone_id = self._get_zone_id(domain)
             if not zone_id:
                 self.logger.error(f"Could not find zone for {domain}")
                 success = False
                 continue
 
-            if self.mail_config.create_mx:
-                success &= self._ensure_mx_record(zone_id, domain)
-
-            if self.mail_config.create_spf:
-                success &= self._ensure_spf_record(zone_id, domain, all_ips)
-
-            if self.mail_config.create_dkim:
-                success &= self._ensure_dkim_record(zone_id, domain, selector)
-
-            if self.mail_config.create_dmarc:
-                success &= self._ensure_dmarc_record(zone_id, domain)
+            tasks.append(
+                partial(
+                    self._ensure_domain_records, domain, selector, zone_id, spf_content
+                )
+            )
 
         # PTR record for outbound IP (used for mail delivery)
         if self.ptr_config.enabled:
             ptr_ip = outbound_ip or incoming_ip
             if ptr_ip:
-                success &= self._ensure_ptr_record(ptr_ip)
+                tasks.append(partial(self._ensure_ptr_record, ptr_ip))
             else:
                 self.logger.warning("No outbound IP detected, skipping PTR setup")
 
+        if tasks:
+            workers = min(self.mail_config.concurrency, len(tasks))
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="dns"
+            ) as executor:
+                futures = [executor.submit(task) for task in tasks]
+                for future in as_completed(futures):
+                    success &= future.result()
+
         self.logger.info("\n" + "=" * 60)
         if success:
             self.logger.info("DNS initialization completed successfully")
@@ -315,14 +386,40 @@ class DNSManager:
 
         return success
 
+    def _ensure_domain_records(
+        self, domain: str, selector: str, zone_id: str, spf_content: str
+    ) -> bool:
+        """Create/update MX, SPF, DKIM and DMARC records for one domain"""
+        self.logger.info(f"\n--- Domain: {domain} (selector: {selector}) ---")
+
+        records: list[DNSRecord] = []
+
+        if self.mail_config.create_mx:
+            records.append(self._mx_record(domain))
+
+        if self.mail_config.create_spf:
+            records.append(self._spf_record(domain, spf_content))
+
+        if self.mail_config.create_dkim:
+            dkim_record = self._dkim_record(domain, selector)
+            if dkim_record:
+                records.append(dkim_record)
+
+        if self.mail_config.create_dmarc:
+            records.append(self._dmarc_record(domain))
+
+        # One zone listing serves all lookups for this domain
+        return self.provider.ensure_records_batch(zone_id, records)
+
     def _ensure_a_record(self, ip: str) -> bool:
         """Create/update A record for mail hostname"""
         hostname = self.mail_config.hostname
-        domain = self._extract_domain(hostname)
 
-        zone_id = self._get_zone_id(domain)
+        # The provider walks up from the hostname to its zone; cutting it to
+        # the last two labels would miss zones like example.co.uk
+        zone_id = self._get_zone_id(hostname)
         if not zone_id:
-            self.logger.error(f"Could not find zone for {domain}")
+            self.logger.error(f"Could not find zone for {hostname}")
             return False
 
         record = DNSRecord(
@@ -334,9 +431,9 @@ class DNSManager:
 
         return self.provider.ensure_record(zone_id, record)
 
-    def _ensure_mx_record(self, zone_id: str, domain: str) -> bool:
-        """Create/update MX record"""
-        record = DNSRecord(
+    def _mx_record(self, domain: str) -> DNSRecord:
+        """Build MX record"""
+        return DNSRecord(
             name=domain,
             type=RecordType.MX,
             content=self.mail_config.hostname,
@@ -344,70 +441,68 @@ class DNSManager:
             priority=10,
         )
 
-        return self.provider.ensure_record(zone_id, record)
-
-    def _ensure_spf_record(self, zone_id: str, domain: str, ips: list[str]) -> bool:
-        """Create/update SPF record"""
-        record = DNSRecord(
+    def _spf_record(self, domain: str, content: str) -> DNSRecord:
+        """Build SPF record"""
+        return DNSRecord(
             name=domain,
             type=RecordType.TXT,
-            content=self.build_spf_record(ips),
+            content=content,
             ttl=self.mail_config.ttl,
         )
 
-        return self.provider.ensure_record(zone_id, record)
-
-    def _ensure_dkim_record(self, zone_id: str, domain: str, selector: str) -> bool:
-        """Create/update DKIM record"""
+    def _dkim_record(self, domain: str, selector: str) -> Optional[DNSRecord]:
+        """Build DKIM record, None if the DKIM secret doesn't exist yet"""
         # Get DKIM record from Kubernetes secret
-        dkim_content = self.k8s.get_dkim_record(domain)
+        dkim_content = self._get_dkim_record(domain)
         if not dkim_content:
             self.logger.warning(f"DKIM secret not found for {domain}, skipping")
-            return True  # Not a failure, just skip
+            return None  # Not a failure, just skip
 
-        record = DNSRecord(
+        return DNSRecord(
             name=f"{selector}._domainkey.{domain}",
             type=RecordType.TXT,
             content=dkim_content,
             ttl=self.mail_config.ttl,
         )
 
-        return self.provider.ensure_record(zone_id, record)
-
-    def _ensure_dmarc_record(self, zone_id: str, domain: str) -> bool:
-        """Create/update DMARC record"""
-        record = DNSRecord(
+    def _dmarc_record(self, domain: str) -> DNSRecord:
+        """Build DMARC record"""
+        return DNSRecord(
             name=f"_dmarc.{domain}",
             type=RecordType.TXT,
             content=self.build_dmarc_record(domain),
             ttl=self.mail_config.ttl,
         )
 
-        return self.provider.ensure_record(zone_id, record)
-
     def cleanup(self) -> bool:
         """Remove all DNS records owned by this instance"""
         self.logger.info("Cleaning up owned DNS records...")
 
-        success = True
+        self._prefetch_zones()
 
+        # Domains sharing a zone list (and delete) its records only once
+        zones: dict[str, str] = {}  # zone_id -> first domain in it
         for domain_cfg in self.mail_config.domains:
             domain = domain_cfg["name"]
             zone_id = self._get_zone_id(domain)
 
-            if not zone_id:
-                continue
+            if zone_id:
+                zones.setdefault(zone_id, domain)
+                self.logger.info(f"Cleaning up {domain} (zone {zone_id})")
 
-            owned = self.provider.list_owned_records(zone_id)
-            self.logger.info(f"Found {len(owned)} owned records in {domain}")
+        if not zones:
+            return True
 
-            for record in owned:
-                if not self.provider.delete_owned_record(
-                    zone_id, record.name, record.type
-                ):
-                    success = False
+        # Each zone is listed once and its owned records deleted in one
+        # batch; zones are independent, so they run concurrently, bounded
+        # like provisioning
+        workers = min(self.mail_config.concurrency, len(zones))
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="dns"
+        ) as executor:
+            results = list(executor.map(self.provider.delete_owned_records, zones))
 
-        return success
+        return all(results)
 
     def verify(self, timeout: int = 600, interval: int = 10) -> bool:
         """
@@ -415,59 +510,128 @@ class DNSManager:
 
         Args:
             timeout: Maximum seconds to wait
-            interval: Seconds between checks
+            interval: Maximum seconds between checks
 
         Returns:
             True if all required records are verified
         """
-        import socket
-
         self.logger.info(f"Verifying DNS propagation (timeout: {timeout}s)...")
 
-        start_time = time.time()
+        # (label, lookup) pairs, built once and all resolved concurrently on
+        # every pass
+        checks: list[tuple[str, Callable[[], object]]] = []
+
+        # Authoritative resolvers by zone, see _authoritative_resolver()
+        resolvers: dict[str, "Resolver"] = {}
 
-        while True:
-            all_verified = True
-            status: list[str] = []
-
-            # Check A record
-            if self.mail_config.create_a:
-                try:
-                    socket.gethostbyname(self.mail_config.hostname)
-                    status.append(f"A:{self.mail_config.hostname}:✓")
-                except socket.gaierror:
-                    status.append(f"A:{self.mail_config.hostname}:✗")
-                    all_verified = False
-
-            # Check DKIM records
-            if self.mail_config.create_dkim:
-                for domain_cfg in self.mail_config.domains:
-                    domain = domain_cfg["name"]
-                    selector = domain_cfg.get("dkimSelector", "mail")
-                    dkim_name = f"{selector}._domainkey.{domain}"
-
-                    try:
-                        import dns.resolver
-
-                        dns.resolver.resolve(dkim_name, "TXT")
-                        status.append(f"DKIM:{domain}:✓")
-                    except Exception:
-                        status.append(f"DKIM:{domain}:✗")
-                        all_verified = False
-
-            elapsed = int(time.time() - start_time)
-
-            if all_verified:
-                self.logger.info(f"All DNS records verified: {' '.join(status)}")
-                return True
-
-            if elapsed >= timeout:
-                self.logger.error(f"DNS verification timeout after {timeout}s")
-                self.logger.error(f"Status: {' '.join(status)}")
+        # Check A record
+        if self.mail_config.create_a:
+            hostname = self.mail_config.hostname
+            if HAS_DNSPYTHON:
+                resolver = self._authoritative_resolver(hostname, resolvers)
+                lookup = partial(resolver.resolve, hostname, "A")
+            else:
+                lookup = partial(socket.gethostbyname, hostname)
+            checks.append((f"A:{hostname}", lookup))
+
+        # Check DKIM records
+        if self.mail_config.create_dkim and self.mail_config.domains:
+            if not HAS_DNSPYTHON:
+                self.logger.error("dnspython not installed, cannot verify DKIM records")
                 return False
 
-            self.logger.info(f"[{elapsed}s/{timeout}s] {' '.join(status)}")
-            time.sleep(interval)
+            for domain_cfg in self.mail_config.domains:
+                domain = domain_cfg["name"]
+                selector = domain_cfg.get("dkimSelector", "mail")
+                dkim_name = f"{selector}._domainkey.{domain}"
+                resolver = self._authoritative_resolver(domain, resolvers)
+                checks.append(
+                    (f"DKIM:{domain}", partial(resolver.resolve, dkim_name, "TXT"))
+                )
+
+        if not checks:
+            self.logger.info("No DNS records to verify")
+            return True
+
+        start_time = time.time()
+        verified = [False] * len(checks)
+
+        # Poll quickly at first, backing off to `interval` while records
+        # are still propagating
+        delay = min(1.0, interval)
+
+        with ThreadPoolExecutor(
+            max_workers=len(checks), thread_name_prefix="verify"
+        ) as executor:
+            while True:
+                # Records that resolved once are not looked up again
+                pending = [i for i, ok in enumerate(verified) if not ok]
+                results = executor.map(
+                    self._lookup_succeeds, (checks[i][1] for i in pending)
+                )
+                for i, ok in zip(pending, results):
+                    verified[i] = ok
+
+                status = [
+                    f"{label}:{'✓' if ok else '✗'}"
+                    for (label, _), ok in zip(checks, verified)
+                ]
+
+                elapsed = int(time.time() - start_time)
+
+                if all(verified):
+                    self.logger.info(f"All DNS records verified: {' '.join(status)}")
+                    return True
+
+                if elapsed >= timeout:
+                    self.logger.error(f"DNS verification timeout after {timeout}s")
+                    self.logger.error(f"Status: {' '.join(status)}")
+                    return False
+
+                self.logger.info(f"[{elapsed}s/{timeout}s] {' '.join(status)}")
+                time.sleep(delay)
+                delay = min(delay * 2, interval)
+
+    def _authoritative_resolver(
+        self, name: str, resolvers: dict[str, "Resolver"]
+    ) -> "Resolver":
+        """
+        Get a resolver that queries the authoritative servers of name's zone.
+
+        Recursive resolvers cache a miss for the zone's negative TTL, so a
+        record probed just before it was created would keep failing there
+        for minutes. Falls back to the system resolver if the zone's name
+        servers can't be found.
+
+        Args:
+            name: Name inside the zone
+            resolvers: Resolvers already built, keyed by zone (updated)
+        """
+        try:
+            zone = dns.resolver.zone_for_name(name).to_text()  # pyright: ignore[reportOptionalMemberAccess]
+            if zone not in resolvers:
+                addresses = [
+                    rr.address
+                    for ns in dns.resolver.resolve(zone, "NS")  # pyright: ignore[reportOptionalMemberAccess]
+                    for rr in dns.resolver.resolve(ns.target, "A")  # pyright: ignore[reportOptionalMemberAccess]
+                ]
+                resolver = dns.resolver.Resolver(configure=False)  # pyright: ignore[reportOptionalMemberAccess]
+                resolver.nameservers = addresses
+                resolvers[zone] = resolver
+                self.logger.debug(f"Verifying {zone} against {', '.join(addresses)}")
+            return resolvers[zone]
+        except dns.exception.DNSException as e:  # pyright: ignore[reportOptionalMemberAccess]
+            self.logger.debug(f"No authoritative servers for {name}: {e}")
+            return dns.resolver.Resolver()  # pyright: ignore[reportOptionalMemberAccess]
+
+    @staticmethod
+    def _lookup_succeeds(lookup: Callable[[], object]) -> bool:
+        """Run a DNS lookup, True if it resolved"""
+        try:
+            lookup()
+            return True
+        except Exception:
+            return False
 
     def status(self) -> dict[str, Any]:
         """Get current DNS status"""
@@ -476,18 +640,33 @@ class DNSManager:
             "domains": {},
         }
 
-        for domain_cfg in self.mail_config.domains:
-            domain = domain_cfg["name"]
-            zone_id = self._get_zone_id(domain)
+        self._prefetch_zones()
+
+        zone_ids = {
+            d["name"]: self._get_zone_id(d["name"]) for d in self.mail_config.domains
+        }
+
+        # One listing per zone, all zones listed concurrently
+        zones = list(dict.fromkeys(z for z in zone_ids.values() if z))
+        owned_by_zone: dict[str, list[DNSRecord]] = {}
+        if zones:
+            workers = min(self.mail_config.concurrency, len(zones))
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="dns"
+            ) as executor:
+                owned_by_zone = dict(
+                    zip(zones, executor.map(self.provider.list_owned_records, zones))
+                )
 
+        # Filled in config order, so the output stays deterministic
+        for domain, zone_id in zone_ids.items():
             domain_status: dict[str, Any] = {
                 "zone_id": zone_id,
                 "records": [],
             }
 
             if zone_id:
-                owned = self.provider.list_owned_records(zone_id)
-                for record in owned:
+                for record in owned_by_zone[zone_id]:
                     domain_status["records"].append(
                         {
                             "name": record.name,
@@ -516,15 +695,27 @@ class DNSManager:
             Tuple of (all_correct, list of issues)
         """
         issues: list[str] = []
+        config = self.mail_config
+
+        self._prefetch_zones(include_hostname=config.create_a)
+
+        # One listing per zone serves every lookup in it
+        zone_records: dict[str, Optional[ZoneRecordCache]] = {}
+
+        def find(zone_id: str, record_type: RecordType, name: str) -> list[DNSRecord]:
+            if zone_id not in zone_records:
+                zone_records[zone_id] = self.provider.load_zone_records(zone_id)
+            return self.provider.find_records(
+                zone_id, record_type, name, zone_records[zone_id]
+            )
 
         # Check A record for mail hostname
-        if self.mail_config.create_a:
-            hostname = self.mail_config.hostname
-            domain = self._extract_domain(hostname)
-            zone_id = self._get_zone_id(domain)
+        if config.create_a:
+            hostname = config.hostname
+            zone_id = self._get_zone_id(hostname)
 
             if zone_id:
-                existing = self.provider.list_records(zone_id, RecordType.A, hostname)
+                existing = find(zone_id, RecordType.A, hostname)
                 if not existing:
                     issues.append(f"A record for {hostname} missing")
                 elif existing[0].content != incoming_ip:
@@ -532,8 +723,11 @@ class DNSManager:
                         f"A record {hostname}: {existing[0].content} != {incoming_ip}"
                     )
 
+        # SPF content is the same for every domain
+        expected_spf = self.build_spf_record(all_ips)
+
         # Check per-domain records
-        for domain_cfg in self.mail_config.domains:
+        for domain_cfg in config.domains:
             domain = domain_cfg["name"]
             selector = domain_cfg.get("dkimSelector", "mail")
 
@@ -543,24 +737,23 @@ class DNSManager:
                 continue
 
             # Check MX record
-            if self.mail_config.create_mx:
-                existing = self.provider.list_records(zone_id, RecordType.MX, domain)
+            if config.create_mx:
+                existing = find(zone_id, RecordType.MX, domain)
                 if not existing:
                     issues.append(f"MX record for {domain} missing")
-                elif existing[0].content != self.mail_config.hostname:
+                elif existing[0].content != config.hostname:
                     issues.append(
-                        f"MX record {domain}: {existing[0].content} != {self.mail_config.hostname}"
+                        f"MX record {domain}: {existing[0].content} != {config.hostname}"
                     )
 
             # Check SPF record
-            if self.mail_config.create_spf:
-                expected_spf = self.build_spf_record(all_ips)
-                existing = self.provider.list_records(zone_id, RecordType.TXT, domain)
+            if config.create_spf:
+                existing = find(zone_id, RecordType.TXT, domain)
                 spf_found = False
                 for rec in existing:
-                    if rec.content.startswith("v=spf1"):
+                    if self._txt_value(rec.content).lower().startswith("v=spf1"):
                         spf_found = True
-                        if rec.content != expected_spf:
+                        if not self._spf_equal(rec.content, expected_spf):
                             issues.append(
                                 f"SPF record {domain} mismatch: {rec.content} != {expected_spf}"
                             )
@@ -569,12 +762,10 @@ class DNSManager:
                     issues.append(f"SPF record for {domain} missing")
 
             # Check DKIM record
-            if self.mail_config.create_dkim:
+            if config.create_dkim:
                 dkim_name = f"{selector}._domainkey.{domain}"
-                existing = self.provider.list_records(
-                    zone_id, RecordType.TXT, dkim_name
-                )
-                dkim_content = self.k8s.get_dkim_record(domain)
+                existing = find(zone_id, RecordType.TXT, dkim_name)
+                dkim_content = self._get_dkim_record(domain)
                 if dkim_content:
                     if not existing:
                         issues.append(f"DKIM record for {domain} missing")
@@ -582,21 +773,57 @@ class DNSManager:
                         issues.append(f"DKIM record {domain} mismatch")
 
             # Check DMARC record
-            if self.mail_config.create_dmarc:
+            if config.create_dmarc:
                 dmarc_name = f"_dmarc.{domain}"
                 expected_dmarc = self.build_dmarc_record(domain)
-                existing = self.provider.list_records(
-                    zone_id, RecordType.TXT, dmarc_name
-                )
+                existing = find(zone_id, RecordType.TXT, dmarc_name)
                 if not existing:
                     issues.append(f"DMARC record for {domain} missing")
-                elif existing[0].content != expected_dmarc:
+                elif not self._dmarc_equal(existing[0].content, expected_dmarc):
                     issues.append(
                         f"DMARC record {domain}: {existing[0].content} != {expected_dmarc}"
                     )
 
         return (len(issues) == 0, issues)
 
+    @staticmethod
+    def _txt_value(content: str) -> str:
+        """TXT content without the surrounding quotes some providers return"""
+        content = content.strip()
+        if len(content) >= 2 and content[0] == content[-1] == '"':
+            return content[1:-1]
+        return content
+
+    @classmethod
+    def _spf_equal(cls, a: str, b: str) -> bool:
+        """
+        Compare SPF records by meaning rather than spelling.
+
+        Mechanisms are case-insensitive and ip4/ip6 order doesn't matter;
+        the order of everything else (includes, the final all) does.
+        """
+
+        def normalize(content: str) -> tuple[list[str], set[str]]:
+            terms = cls._txt_value(content).lower().split()
+            ips = {t for t in terms if t.startswith(("ip4:", "ip6:", "+ip4:", "+ip6:"))}
+            return [t for t in terms if t not in ips], {t.lstrip("+") for t in ips}
+
+        return normalize(a) == normalize(b)
+
+    @classmethod
+    def _dmarc_equal(cls, a: str, b: str) -> bool:
+        """Compare DMARC records as tag=value pairs (order and spacing ignored)"""
+
+        def normalize(content: str) -> dict[str, str]:
+            tags: dict[str, str] = {}
+            for part in cls._txt_value(content).split(";"):
+                key, sep, value = part.partition("=")
+                if sep:
+                    tags[key.strip().lower()] = value.strip()
+            return tags
+
+        return normalize(a) == normalize(b)
+
 
 def setup_logging(verbose: bool = False) -> None:
     """Configure logging"""
@@ -685,11 +912,9 @@ def main() -> None:
     if args.command in ("init", "update"):
         success = manager.init_or_update(wait_for_lb=args.wait_for_lb)
 
-        # Save IPs to shared volume for watcher
-        if success and shared_dir.exists():
-            incoming_ip = ip_detector.get_incoming_ip(k8s, wait_timeout=0)
-            outbound_ip = ip_detector.detect_outbound_ip()
-            all_ips = ip_detector.get_all_ips(k8s, wait_timeout=0)
+        # Save the IPs the records were built from to shared volume for watcher
+        if success and shared_dir.exists() and manager.detected_ips:
+            incoming_ip, outbound_ip, all_ips = manager.detected_ips
 
             if incoming_ip:
                 # Save full state as JSON
@@ -699,12 +924,12 @@ def main() -> None:
                     "all_ips": all_ips,
                 }
                 state_file = shared_dir / "dns-state.json"
-                state_file.write_text(json.dumps(state))
+                write_atomic(state_file, json.dumps(state))
                 logger.info(f"Saved state to {state_file}")
 
                 # Also write legacy file for backward compatibility
                 ip_file = shared_dir / "current-ip"
-                ip_file.write_text(incoming_ip)
+                write_atomic(ip_file, incoming_ip)
                 logger.info(f"Saved incoming IP to {ip_file}")
 
         sys.exit(0 if success else 1)
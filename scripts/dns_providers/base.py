@@ -6,13 +6,20 @@ Similar to external-dns approach for record management.
 """
 
 import logging
+import re
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# Ownership TXT content: heritage=mail-relay,owner={owner_id},record-type={type}
+_OWNERSHIP_RE = re.compile(r"heritage=mail-relay,owner=([^,]+),record-type=([A-Z]+)")
+
+# Zone records bucketed by (type, lowercased name), see load_zone_records()
+ZoneRecordCache = dict[tuple["RecordType", str], list["DNSRecord"]]
+
 
 class RecordType(str, Enum):
     """Supported DNS record types"""
@@ -24,7 +31,7 @@ class RecordType(str, Enum):
     CNAME = "CNAME"
 
 
-@dataclass
+@dataclass(slots=True)
 class DNSRecord:
     """Represents a DNS record"""
 
@@ -37,16 +44,18 @@ class DNSRecord:
 
     # Internal tracking
     record_id: Optional[str] = None
+    _ownership_name: str = field(init=False, repr=False, default="")
 
     def __post_init__(self) -> None:
         # Normalize record name (remove trailing dot)
         self.name = self.name.rstrip(".")
+        # Format: _mail-relay-owner.{original_name}
+        self._ownership_name = f"_mail-relay-owner.{self.name}"
 
     @property
     def ownership_record_name(self) -> str:
-        """Generate TXT record name for ownership tracking"""
-        # Format: _mail-relay-owner.{original_name}
-        return f"_mail-relay-owner.{self.name}"
+        """TXT record name for ownership tracking"""
+        return self._ownership_name
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, DNSRecord):
@@ -94,37 +103,33 @@ class DNSProvider(ABC):
     def __init__(self, config: DNSProviderConfig):
         self.config = config
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        # Ownership TXT content per record type, fixed for this owner
+        self._ownership_contents = {
+            rt: f"heritage=mail-relay,owner={config.owner_id},record-type={rt.value}"
+            for rt in RecordType
+        }
+        self._owned_re = re.compile(
+            rf"heritage=mail-relay,owner={re.escape(config.owner_id)},record-type="
+        )
 
     @property
     def owner_id(self) -> str:
         return self.config.owner_id
 
     def _ownership_content(self, record_type: RecordType) -> str:
-        """Generate ownership TXT record content"""
-        return (
-            f"heritage=mail-relay,owner={self.owner_id},record-type={record_type.value}"
-        )
+        """Ownership TXT record content"""
+        return self._ownership_contents[record_type]
 
     def _parse_ownership(self, content: str) -> Optional[dict[str, str]]:
         """Parse ownership TXT record content"""
-        try:
-            parts: dict[str, str] = {}
-            for part in content.split(","):
-                if "=" in part:
-                    key, value = part.split("=", 1)
-                    parts[key] = value
-            if parts.get("heritage") == "mail-relay":
-                return parts
-        except Exception:
-            pass
-        return None
+        m = _OWNERSHIP_RE.match(content)
+        if not m:
+            return None
+        return {"heritage": "mail-relay", "owner": m[1], "record-type": m[2]}
 
     def _is_owned_by_us(self, ownership_content: str) -> bool:
         """Check if record is owned by this instance"""
-        parsed = self._parse_ownership(ownership_content)
-        if parsed and parsed.get("owner") == self.owner_id:
-            return True
-        return False
+        return self._owned_re.match(ownership_content) is not None
 
     # ==========================================================================
     # Abstract methods - must be implemented by providers
@@ -136,7 +141,7 @@ class DNSProvider(ABC):
         Get zone ID for a domain.
 
         Args:
-            domain: Domain name to find zone for
+            domain: Domain name to find zone for (may be below the zone apex)
 
         Returns:
             Zone ID string or None if not found
@@ -205,6 +210,52 @@ class DNSProvider(ABC):
         """
         pass
 
+    def create_records(self, zone_id: str, records: list[DNSRecord]) -> bool:
+        """
+        Create several records, stopping at the first failure.
+
+        Providers with a bulk endpoint override this to send one request.
+
+        Args:
+            zone_id: Zone identifier
+            records: Records to create
+
+        Returns:
+            True if all records were created
+        """
+        return all(self.create_record(zone_id, record) for record in records)
+
+    def list_all_records(self, zone_id: str) -> Optional[list[DNSRecord]]:
+        """
+        List every record of a zone.
+
+        Providers whose listings can fail part-way override this to report
+        an incomplete listing instead of returning what they got.
+
+        Args:
+            zone_id: Zone identifier
+
+        Returns:
+            All records, or None if the listing failed or came back empty
+        """
+        return self.list_records(zone_id) or None
+
+    def delete_records(self, zone_id: str, record_ids: list[str]) -> bool:
+        """
+        Delete several records, carrying on past failures.
+
+        Providers with a bulk endpoint override this to send one request.
+
+        Args:
+            zone_id: Zone identifier
+            record_ids: Identifiers of the records to delete
+
+        Returns:
+            True if all records were deleted
+        """
+        results = [self.delete_record(zone_id, record_id) for record_id in record_ids]
+        return all(results)
+
     def set_ptr(self, ip: str, hostname: str) -> bool:
         """
         Set PTR (reverse DNS) record for an IP address.
@@ -227,7 +278,111 @@ class DNSProvider(ABC):
     # High-level operations with ownership tracking
     # ==========================================================================
 
-    def ensure_record(self, zone_id: str, record: DNSRecord) -> bool:
+    def load_zone_records(self, zone_id: str) -> Optional[ZoneRecordCache]:
+        """
+        Fetch all records of a zone once, bucketed by type and name.
+
+        Returns:
+            Record cache for ensure_record(), or None if the zone listing
+            failed or came back empty (treated as unavailable, lookups fall
+            back to per-record API calls)
+        """
+        records = self.list_all_records(zone_id)
+        if records is None:
+            return None
+
+        cache: ZoneRecordCache = {}
+        for rec in records:
+            cache.setdefault((rec.type, rec.name.lower()), []).append(rec)
+        return cache
+
+    def find_records(
+        self,
+        zone_id: str,
+        record_type: RecordType,
+        name: str,
+        cache: Optional[ZoneRecordCache] = None,
+    ) -> list[DNSRecord]:
+        """List records by type and name, from the cache when given"""
+        if cache is None:
+            return self.list_records(zone_id, record_type, name)
+        return list(cache.get((record_type, name.lower()), []))
+
+    def _cache_written(
+        self, cache: Optional[ZoneRecordCache], record: DNSRecord
+    ) -> None:
+        """Keep the cache in line with a record we just created or updated"""
+        if cache is None:
+            return
+        bucket = cache.setdefault((record.type, record.name.lower()), [])
+        bucket[:] = [r for r in bucket if r.record_id != record.record_id]
+        bucket.append(record)
+
+    def ensure_records_batch(self, zone_id: str, records: list[DNSRecord]) -> bool:
+        """
+        Ensure several records of one zone exist with ownership tracking.
+
+        The zone is listed once up front, so existence and ownership checks
+        cost no API calls; only writes go to the provider. Records that
+        don't exist yet are created together with their ownership TXTs in
+        one create_records() call.
+
+        Args:
+            zone_id: Zone identifier
+            records: Desired record states
+
+        Returns:
+            True if all records are in desired state
+        """
+        cache = self.load_zone_records(zone_id)
+
+        # New records whose ownership name is free can be created blindly;
+        # the rest (updates, shared ownership names) go through ensure_record
+        # afterwards, so they see what the batch wrote
+        creates: list[DNSRecord] = []
+        others: list[DNSRecord] = []
+        claimed: set[str] = set()
+        for record in records:
+            ownership_name = record.ownership_record_name.lower()
+            if (
+                cache is not None
+                and not self.config.dry_run
+                and ownership_name not in claimed
+                and not self.find_records(zone_id, record.type, record.name, cache)
+                and not self.find_records(
+                    zone_id, RecordType.TXT, ownership_name, cache
+                )
+            ):
+                claimed.add(ownership_name)
+                creates.append(record)
+            else:
+                others.append(record)
+
+        success = True
+        if creates:
+            batch: list[DNSRecord] = []
+            for record in creates:
+                self.logger.info(
+                    f"Creating {record.type.value} {record.name} = {record.content}"
+                )
+                batch += (record, self._ownership_record(record))
+
+            if self.create_records(zone_id, batch):
+                for record in batch:
+                    self._cache_written(cache, record)
+            else:
+                success = False
+
+        for record in others:
+            success &= self.ensure_record(zone_id, record, cache)
+        return success
+
+    def ensure_record(
+        self,
+        zone_id: str,
+        record: DNSRecord,
+        cache: Optional[ZoneRecordCache] = None,
+    ) -> bool:
         """
         Ensure a DNS record exists with ownership tracking.
 
@@ -238,11 +393,12 @@ class DNSProvider(ABC):
         Args:
             zone_id: Zone identifier
             record: Desired record state
+            cache: Zone records from load_zone_records(), skips lookups
 
         Returns:
             True if record is in desired state
         """
-        existing = self.list_records(zone_id, record.type, record.name)
+        existing = self.find_records(zone_id, record.type, record.name, cache)
 
         if existing:
             # Check if any existing record already has the desired content
@@ -259,7 +415,7 @@ class DNSProvider(ABC):
                 for rec in existing:
                     if rec.record_id != matching_record.record_id and rec.record_id:
                         # Check if this duplicate is owned by us before deleting
-                        if self._check_ownership(zone_id, record):
+                        if self._check_ownership(zone_id, record, cache):
                             self.logger.info(
                                 f"Deleting duplicate {record.type.value} {record.name}: {rec.content}"
                             )
@@ -278,7 +434,7 @@ class DNSProvider(ABC):
             existing_record = existing[0]
 
             # Check ownership
-            if not self._check_ownership(zone_id, record):
+            if not self._check_ownership(zone_id, record, cache):
                 self.logger.warning(
                     f"Record {record.type.value} {record.name} exists but not owned by us, skipping"
                 )
@@ -295,7 +451,10 @@ class DNSProvider(ABC):
                 self.logger.info("[DRY RUN] Would update record")
                 return True
 
-            return self.update_record(zone_id, record)
+            if not self.update_record(zone_id, record):
+                return False
+            self._cache_written(cache, record)
+            return True
 
         # Create new record with ownership
         self.logger.info(
@@ -306,9 +465,20 @@ class DNSProvider(ABC):
             self.logger.info("[DRY RUN] Would create record")
             return True
 
-        if self.create_record(zone_id, record):
-            return self._set_ownership(zone_id, record)
-        return False
+        ownership_record = self._ownership_record(record)
+        if self.find_records(zone_id, RecordType.TXT, ownership_record.name, cache):
+            # Ownership name is taken (another type at this name), reconcile it
+            if not self.create_record(zone_id, record):
+                return False
+            self._cache_written(cache, record)
+            return self._set_ownership(zone_id, record, cache)
+
+        # Record and its ownership TXT in one go where the provider can
+        if not self.create_records(zone_id, [record, ownership_record]):
+            return False
+        self._cache_written(cache, record)
+        self._cache_written(cache, ownership_record)
+        return True
 
     def delete_owned_record(
         self, zone_id: str, name: str, record_type: RecordType
@@ -353,10 +523,17 @@ class DNSProvider(ABC):
             return self._delete_ownership(zone_id, name, record_type)
         return False
 
-    def _check_ownership(self, zone_id: str, record: DNSRecord) -> bool:
+    def _check_ownership(
+        self,
+        zone_id: str,
+        record: DNSRecord,
+        cache: Optional[ZoneRecordCache] = None,
+    ) -> bool:
         """Check if we own a record via its ownership TXT record"""
         ownership_name = record.ownership_record_name
-        ownership_records = self.list_records(zone_id, RecordType.TXT, ownership_name)
+        ownership_records = self.find_records(
+            zone_id, RecordType.TXT, ownership_name, cache
+        )
 
         for txt_record in ownership_records:
             if self._is_owned_by_us(txt_record.content):
@@ -365,25 +542,40 @@ class DNSProvider(ABC):
         # No ownership record = not owned
         return False
 
-    def _set_ownership(self, zone_id: str, record: DNSRecord) -> bool:
-        """Create ownership TXT record for a managed record"""
-        ownership_record = DNSRecord(
+    def _ownership_record(self, record: DNSRecord) -> DNSRecord:
+        """Build the ownership TXT record for a managed record"""
+        return DNSRecord(
             name=record.ownership_record_name,
             type=RecordType.TXT,
             content=self._ownership_content(record.type),
             ttl=record.ttl,
         )
 
+    def _set_ownership(
+        self,
+        zone_id: str,
+        record: DNSRecord,
+        cache: Optional[ZoneRecordCache] = None,
+    ) -> bool:
+        """Create ownership TXT record for a managed record"""
+        ownership_record = self._ownership_record(record)
+
         # Check if ownership record already exists
-        existing = self.list_records(zone_id, RecordType.TXT, ownership_record.name)
+        existing = self.find_records(
+            zone_id, RecordType.TXT, ownership_record.name, cache
+        )
         if existing:
             # Update if different
-            if existing[0].content != ownership_record.content:
-                ownership_record.record_id = existing[0].record_id
-                return self.update_record(zone_id, ownership_record)
-            return True
+            if existing[0].content == ownership_record.content:
+                return True
+            ownership_record.record_id = existing[0].record_id
+            written = self.update_record(zone_id, ownership_record)
+        else:
+            written = self.create_record(zone_id, ownership_record)
 
-        return self.create_record(zone_id, ownership_record)
+        if written:
+            self._cache_written(cache, ownership_record)
+        return written
 
     def _delete_ownership(
         self, zone_id: str, name: str, record_type: RecordType
@@ -403,11 +595,75 @@ class DNSProvider(ABC):
 
     def list_owned_records(self, zone_id: str) -> list[DNSRecord]:
         """List all records owned by this instance in a zone"""
-        owned: list[DNSRecord] = []
+        # One zone listing serves the ownership TXTs and the records they
+        # point to, instead of a request per owned record
+        cache = self.load_zone_records(zone_id)
 
-        # Find all ownership TXT records
-        all_txt = self.list_records(zone_id, RecordType.TXT)
+        return [
+            rec for _, records in self._owned_records(zone_id, cache) for rec in records
+        ]
+
+    def delete_owned_records(self, zone_id: str) -> bool:
+        """
+        Delete all records owned by this instance in a zone.
 
+        The zone is listed once, and every owned record is deleted together
+        with its ownership TXT in one delete_records() call.
+
+        Args:
+            zone_id: Zone identifier
+
+        Returns:
+            True if all owned records were deleted
+        """
+        cache = self.load_zone_records(zone_id)
+        owned = [
+            (txt_record, records[0])
+            for txt_record, records in self._owned_records(zone_id, cache)
+            if records
+        ]
+        self.logger.info(f"Found {len(owned)} owned records in zone {zone_id}")
+
+        record_ids: list[str] = []
+        success = True
+        for txt_record, record in owned:
+            self.logger.info(f"Deleting {record.type.value} {record.name}")
+
+            if not record.record_id or not txt_record.record_id:
+                self.logger.error("Cannot delete record without record_id")
+                success = False
+                continue
+
+            record_ids += (record.record_id, txt_record.record_id)
+
+        # A record can be reached through more than one ownership TXT
+        record_ids = list(dict.fromkeys(record_ids))
+
+        if self.config.dry_run:
+            if record_ids:
+                self.logger.info(f"[DRY RUN] Would delete {len(owned)} records")
+            return success
+
+        if record_ids:
+            success &= self.delete_records(zone_id, record_ids)
+        return success
+
+    def _owned_records(
+        self, zone_id: str, cache: Optional[ZoneRecordCache]
+    ) -> list[tuple[DNSRecord, list[DNSRecord]]]:
+        """Pair each of our ownership TXTs in a zone with the records it marks"""
+        # Find all ownership TXT records
+        if cache is None:
+            all_txt = self.list_records(zone_id, RecordType.TXT)
+        else:
+            all_txt = [
+                rec
+                for (rtype, _), records in cache.items()
+                if rtype == RecordType.TXT
+                for rec in records
+            ]
+
+        owned: list[tuple[DNSRecord, list[DNSRecord]]] = []
         for txt_record in all_txt:
             if not txt_record.name.startswith("_mail-relay-owner."):
                 continue
@@ -421,7 +677,7 @@ class DNSProvider(ABC):
             record_type = RecordType(parsed.get("record-type", "A"))
 
             # Find the actual record
-            records = self.list_records(zone_id, record_type, original_name)
-            owned.extend(records)
+            records = self.find_records(zone_id, record_type, original_name, cache)
+            owned.append((txt_record, records))
 
         return owned
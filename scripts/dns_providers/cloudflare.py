@@ -4,18 +4,48 @@ Cloudflare DNS Provider Implementation
 Uses Cloudflare API v4 for DNS record management with ownership tracking.
 """
 
+import copy
+import json
 import logging
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import Any, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .base import DNSProvider, DNSProviderConfig, DNSRecord, RecordType
 
+# Optional faster JSON codec for large zone listings
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+    HAS_ORJSON = False
+
 logger = logging.getLogger(__name__)
 
 
+def _json_loads(data: bytes) -> Any:
+    """Decode a JSON response body"""
+    if HAS_ORJSON:
+        return orjson.loads(data)  # pyright: ignore[reportOptionalMemberAccess]
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Encode a JSON request body"""
+    if HAS_ORJSON:
+        return orjson.dumps(obj)  # pyright: ignore[reportOptionalMemberAccess]
+    return json.dumps(obj).encode()
+
+
 @dataclass
 class CloudflareConfig(DNSProviderConfig):
     """Cloudflare-specific configuration"""
@@ -70,12 +100,58 @@ class CloudflareProvider(DNSProvider):
     - Rate limiting awareness
     """
 
+    # Extra attempts for requests answered with 429 (the adapter leaves 429
+    # alone, so this is the only rate limit retry)
+    MAX_RATE_LIMIT_RETRIES = 3
+
+    # Longest we sleep for a single Retry-After / rate limit reset
+    MAX_RATE_LIMIT_WAIT = 60.0
+
+    # Pause until the rate limit window resets once fewer calls are left
+    RATE_LIMIT_LOW_WATER = 5
+
+    # Parallel page fetches when a listing spans several pages
+    LIST_PAGE_WORKERS = 8
+
+    # Seconds a record listing is reused; writes to the zone drop it earlier
+    RECORDS_CACHE_TTL = 60.0
+
+    # Seconds the account zone listing and zone misses are trusted, so a
+    # long-running watcher finds zones added after it started
+    ZONE_CACHE_TTL = 300.0
+
     def __init__(self, config: CloudflareConfig):
         super().__init__(config)
         self.cf_config = config
+        # domain -> zone ID
         self._zone_cache: dict[str, str] = dict(config.zone_ids)
+        # domain -> monotonic time it was found to have no zone
+        self._zone_misses: dict[str, float] = {}
+        # Whether every account zone is in _zone_cache (None = not tried yet),
+        # and when that was last tried
+        self._zones_primed: Optional[bool] = None
+        self._zones_primed_at = 0.0
         self._session = self._create_session()
 
+        # Proxy and CA bundle settings from the environment, resolved once:
+        # every request goes to the same API host, so they never differ
+        self._send_settings: dict[str, Any] = self._session.merge_environment_settings(
+            self.cf_config.api_base, {}, None, None, None
+        )
+
+        # (zone_id, type, name) -> (monotonic fetch time, records)
+        self._records_cache: dict[
+            tuple[str, Optional[str], Optional[str]], tuple[float, list[DNSRecord]]
+        ] = {}
+        # zone_id -> count of invalidations; a listing fetched while the
+        # zone was written to is not cached
+        self._records_generation: dict[str, int] = {}
+        self._records_lock = threading.Lock()
+
+        # Rate limit window from the last response headers, if sent
+        self._rl_remaining: Optional[int] = None
+        self._rl_reset = 0.0  # Unix time the window resets
+
     def _create_session(self) -> requests.Session:
         """Create configured requests session"""
         session = requests.Session()
@@ -85,6 +161,23 @@ class CloudflareProvider(DNSProvider):
                 "Content-Type": "application/json",
             }
         )
+        # Accept-Encoding is left to urllib3: it advertises br only when the
+        # brotli package is installed to decode it, otherwise gzip/deflate
+
+        # Transient failures are retried with backoff on a kept-alive pool.
+        # POST is left out: a create that failed late may still have landed,
+        # and retrying it would duplicate the record. 429 is handled by
+        # _api_request, which caps the Retry-After wait
+        retry = Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "PUT", "DELETE"}),
+            respect_retry_after_header=False,
+            raise_on_status=False,  # Let _api_request report Cloudflare's error
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retry)
+        session.mount("https://", adapter)
         return session
 
     def _api_request(
@@ -97,77 +190,333 @@ class CloudflareProvider(DNSProvider):
         """Make API request to Cloudflare"""
         url = f"{self.cf_config.api_base}{endpoint}"
 
+        # Encoded once, reused if the request is retried; Content-Type is
+        # set on the session
+        body = _json_dumps(json_data) if json_data is not None else None
+
         try:
-            response = self._session.request(
-                method=method,
-                url=url,
-                params=params,
-                json=json_data,
-                timeout=self.cf_config.timeout,
+            # Prepared once and sent directly, skipping the per-call
+            # environment lookup of Session.request
+            prepared = self._session.prepare_request(
+                requests.Request(method, url, params=params, data=body)
             )
+            attempt = 0
+            while True:
+                self._wait_for_rate_limit()
+                response = self._session.send(
+                    prepared, timeout=self.cf_config.timeout, **self._send_settings
+                )
+                self._track_rate_limit(response)
+
+                if (
+                    response.status_code != 429
+                    or attempt >= self.MAX_RATE_LIMIT_RETRIES
+                ):
+                    break
+
+                # A rate-limited request was rejected, so retrying is safe
+                # even for POST
+                attempt += 1
+                delay = self._retry_after(response)
+                self.logger.warning(
+                    "Cloudflare rate limit hit, retrying in %.1fs (%s/%s)",
+                    delay,
+                    attempt,
+                    self.MAX_RATE_LIMIT_RETRIES,
+                )
+                time.sleep(delay)
+
+            if response.status_code == 204:
+                return {"success": True, "result": None}
 
-            data: dict[str, Any] = response.json()
+            # Error pages from proxies in front of the API (e.g. HTML 502s
+            # during incidents) are reported as-is instead of parsed
+            content_type = response.headers.get("Content-Type", "")
+            if response.status_code >= 400 and "json" not in content_type:
+                error_msg = f"HTTP {response.status_code}: {response.text[:512]}"
+                self.logger.error("Cloudflare API error: %s", error_msg)
+                raise CloudflareAPIError(error_msg)
+
+            data: dict[str, Any] = _json_loads(response.content)
 
             if not data.get("success", False):
                 errors = data.get("errors", [])
                 error_msg = "; ".join(e.get("message", str(e)) for e in errors)
-                self.logger.error(f"Cloudflare API error: {error_msg}")
+                self.logger.error("Cloudflare API error: %s", error_msg)
                 raise CloudflareAPIError(error_msg, errors)
 
             return data
 
         except requests.RequestException as e:
-            self.logger.error(f"Cloudflare API request failed: {e}")
+            self.logger.error("Cloudflare API request failed: %s", e)
             raise CloudflareAPIError(f"Request failed: {e}")
+        except ValueError as e:
+            # Non-JSON body, e.g. an HTML error page from a proxy
+            self.logger.error("Cloudflare API returned invalid JSON: %s", e)
+            raise CloudflareAPIError(f"Invalid response: {e}")
+
+    def _retry_after(self, response: requests.Response) -> float:
+        """Seconds to wait before retrying a 429 response"""
+        try:
+            delay = float(response.headers.get("Retry-After", "1"))
+        except ValueError:
+            # HTTP-date form; not worth parsing for a bounded retry
+            delay = 1.0
+        return min(max(delay, 0.0), self.MAX_RATE_LIMIT_WAIT)
+
+    def _track_rate_limit(self, response: requests.Response) -> None:
+        """Remember the rate limit window from response headers"""
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset = response.headers.get("X-RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+        try:
+            self._rl_remaining = int(remaining)
+            reset_at = float(reset)
+        except ValueError:
+            return
+        # Either an epoch timestamp or seconds until reset
+        self._rl_reset = reset_at if reset_at > 1e9 else time.time() + reset_at
+
+    def _wait_for_rate_limit(self) -> None:
+        """Sleep until the window resets when nearly out of requests"""
+        if (
+            self._rl_remaining is None
+            or self._rl_remaining >= self.RATE_LIMIT_LOW_WATER
+        ):
+            return
+        delay = min(self._rl_reset - time.time(), self.MAX_RATE_LIMIT_WAIT)
+        if delay > 0:
+            self.logger.info(
+                "Cloudflare rate limit nearly exhausted, pausing %.1fs", delay
+            )
+            time.sleep(delay)
+        self._rl_remaining = None
 
     def get_zone_id(self, domain: str) -> Optional[str]:
         """
         Get zone ID for a domain.
 
         Tries exact match first, then walks up the domain hierarchy.
-        Results are cached for performance.
+        Results are cached for performance; domains that have no zone in
+        this account are remembered for ZONE_CACHE_TTL seconds.
+
+        All account zones are listed on the first call, and again on a miss
+        once that listing is ZONE_CACHE_TTL seconds old; in between the walk
+        needs no API calls. If that listing fails, each label is looked up
+        with its own API call instead, all in parallel.
         """
-        # Check cache first
         if domain in self._zone_cache:
             return self._zone_cache[domain]
 
-        # Try to find zone by walking up domain hierarchy
+        now = time.monotonic()
+        missed_at = self._zone_misses.get(domain)
+        if missed_at is not None and now - missed_at < self.ZONE_CACHE_TTL:
+            return None
+
+        if (
+            self._zones_primed is None
+            or now - self._zones_primed_at >= self.ZONE_CACHE_TTL
+        ):
+            self._zones_primed = self._prime_zone_cache()
+            self._zones_primed_at = now
+
+        if self._zones_primed:
+            return self._find_primed_zone(domain)
+
+        # Look up every label of the hierarchy at once instead of climbing
+        # one round trip at a time; the most specific zone wins
+        candidates: list[str] = []
         check_domain = domain
         while "." in check_domain:
+            candidates.append(check_domain)
+            check_domain = check_domain.split(".", 1)[1]
+
+        had_errors = False
+        if candidates:
+            with ThreadPoolExecutor(max_workers=len(candidates)) as pool:
+                futures = [pool.submit(self._lookup_zone, name) for name in candidates]
+                # Candidates are ordered most specific first
+                for index, future in enumerate(futures):
+                    try:
+                        zone_id = future.result()
+                    except CloudflareAPIError:
+                        had_errors = True
+                        continue
+                    if zone_id is None:
+                        continue
+
+                    for pending in futures[index + 1 :]:
+                        pending.cancel()
+                    # Cache the requested domain, the zone domain and every
+                    # label in between
+                    for name in candidates[: index + 1]:
+                        self._zone_cache[name] = zone_id
+                    self.logger.debug(
+                        "Found zone %s (%s) for %s", candidates[index], zone_id, domain
+                    )
+                    return zone_id
+
+        # Only a clean walk is a definitive miss; API errors are retried next time
+        if not had_errors:
+            self._zone_misses[domain] = time.monotonic()
+
+        self.logger.error("Could not find Cloudflare zone for domain: %s", domain)
+        return None
+
+    def _lookup_zone(self, name: str) -> Optional[str]:
+        """Look up an active zone by exact name, return its ID if found."""
+        data = self._api_request(
+            "GET", "/zones", params={"name": name, "status": "active"}
+        )
+        results = data.get("result", [])
+        return results[0]["id"] if results else None
+
+    def _prime_zone_cache(self) -> bool:
+        """Load all active zones of the account into the zone cache"""
+        zones: dict[str, str] = {}
+        page = 1
+        while True:
             try:
                 data = self._api_request(
                     "GET",
                     "/zones",
-                    params={"name": check_domain, "status": "active"},
+                    params={"status": "active", "per_page": 50, "page": page},
                 )
+            except CloudflareAPIError:
+                self.logger.debug("Could not list zones, looking them up by name")
+                return False
 
-                results = data.get("result", [])
-                if results:
-                    zone_id: str = results[0]["id"]
-                    # Cache both the requested domain and found zone domain
-                    self._zone_cache[domain] = zone_id
-                    self._zone_cache[check_domain] = zone_id
-                    self.logger.debug(
-                        f"Found zone {check_domain} ({zone_id}) for {domain}"
-                    )
-                    return zone_id
+            for zone in data.get("result", []):
+                zones[zone["name"]] = zone["id"]
 
-            except CloudflareAPIError:
-                pass
+            result_info = data.get("result_info", {})
+            if page >= result_info.get("total_pages", 1):
+                break
+            page += 1
+
+        # Explicitly configured zone IDs win over discovered ones
+        for name, zone_id in zones.items():
+            self._zone_cache.setdefault(name, zone_id)
+        self.logger.debug("Loaded %s Cloudflare zone(s)", len(zones))
+        return True
 
-            # Try parent domain
+    def _find_primed_zone(self, domain: str) -> Optional[str]:
+        """Walk up the domain hierarchy through the primed zone cache"""
+        walked: list[str] = []
+        check_domain = domain
+        while check_domain:
+            zone_id = self._zone_cache.get(check_domain)
+            if zone_id:
+                for name in walked:
+                    self._zone_cache[name] = zone_id
+                return zone_id
+            walked.append(check_domain)
             check_domain = check_domain.split(".", 1)[1] if "." in check_domain else ""
 
-        self.logger.error(f"Could not find Cloudflare zone for domain: {domain}")
+        self._zone_misses[domain] = time.monotonic()
+        self.logger.error("Could not find Cloudflare zone for domain: %s", domain)
         return None
 
+    def invalidate_zone_cache(self, domain: Optional[str] = None) -> None:
+        """
+        Forget cached zone lookups.
+
+        Args:
+            domain: Domain to forget, or None for all. Zone IDs configured
+                via CLOUDFLARE_ZONE_IDS are kept.
+        """
+        if domain is None:
+            self._zone_cache = dict(self.cf_config.zone_ids)
+            self._zone_misses.clear()
+            self._zones_primed = None
+        else:
+            if domain not in self.cf_config.zone_ids:
+                self._zone_cache.pop(domain, None)
+            self._zone_misses.pop(domain, None)
+
     def list_records(
         self,
         zone_id: str,
         record_type: Optional[RecordType] = None,
         name: Optional[str] = None,
     ) -> list[DNSRecord]:
-        """List DNS records in a zone with optional filtering"""
+        """
+        List DNS records in a zone with optional filtering.
+
+        Listings are reused for RECORDS_CACHE_TTL seconds, or until a
+        record in the zone is written through this provider. A listing that
+        failed, even part-way, comes back empty and is not cached.
+        """
+        try:
+            return self._cached_records(zone_id, record_type, name)
+        except CloudflareAPIError:
+            return []
+
+    def list_all_records(self, zone_id: str) -> Optional[list[DNSRecord]]:
+        """List every record of a zone; None if any page failed"""
+        try:
+            return self._cached_records(zone_id, None, None) or None
+        except CloudflareAPIError:
+            return None
+
+    def _cached_records(
+        self,
+        zone_id: str,
+        record_type: Optional[RecordType],
+        name: Optional[str],
+    ) -> list[DNSRecord]:
+        """Record listing from the cache or the API; raises if a page fails"""
+        key = (zone_id, record_type.value if record_type else None, name)
+        with self._records_lock:
+            cached = self._records_cache.get(key)
+            generation = self._records_generation.setdefault(zone_id, 0)
+        if cached and time.monotonic() - cached[0] < self.RECORDS_CACHE_TTL:
+            # Copies, callers may set record_id on what they get back
+            return [copy.copy(r) for r in cached[1]]
+
+        fetched_at = time.monotonic()
+        records = self._fetch_records(zone_id, record_type, name)
+        with self._records_lock:
+            # A write during the fetch may be missing from this listing
+            if self._records_generation[zone_id] == generation:
+                self._records_cache[key] = (fetched_at, records)
+        return [copy.copy(r) for r in records]
+
+    def invalidate_records_cache(self, zone_id: Optional[str] = None) -> None:
+        """
+        Forget cached record listings.
+
+        Args:
+            zone_id: Zone to forget, or None for all zones
+        """
+        with self._records_lock:
+            if zone_id is None:
+                self._records_cache.clear()
+                zones = list(self._records_generation)
+            else:
+                for key in [k for k in self._records_cache if k[0] == zone_id]:
+                    del self._records_cache[key]
+                zones = [zone_id]
+
+            # Fetches already under way must not cache what they get
+            for zone in zones:
+                self._records_generation[zone] = (
+                    self._records_generation.get(zone, 0) + 1
+                )
+
+    def _fetch_records(
+        self,
+        zone_id: str,
+        record_type: Optional[RecordType],
+        name: Optional[str],
+    ) -> list[DNSRecord]:
+        """
+        Fetch all pages of a record listing from the API.
+
+        Raises:
+            CloudflareAPIError: If any page could not be fetched
+        """
         params: dict[str, Any] = {"per_page": 100}
 
         if record_type:
@@ -175,42 +524,67 @@ class CloudflareProvider(DNSProvider):
         if name:
             params["name"] = name
 
-        records: list[DNSRecord] = []
-        page = 1
+        def fetch_page(page: int) -> dict[str, Any]:
+            return self._api_request(
+                "GET",
+                f"/zones/{zone_id}/dns_records",
+                params={**params, "page": page},
+            )
 
-        while True:
-            params["page"] = page
+        # Page 1 tells how many pages there are
+        first = fetch_page(1)
+        records = self._parse_records(first)
 
-            try:
-                data = self._api_request(
-                    "GET", f"/zones/{zone_id}/dns_records", params=params
-                )
-            except CloudflareAPIError:
-                break
+        result_info = first.get("result_info", {})
+        total_pages: int = result_info.get("total_pages", 1)
+        if total_pages <= 1:
+            return records
 
-            for item in data.get("result", []):
-                record = DNSRecord(
-                    name=item["name"],
-                    type=RecordType(item["type"]),
-                    content=item["content"],
-                    ttl=item.get("ttl", 1),
-                    priority=item.get("priority"),
-                    proxied=item.get("proxied", False),
-                    record_id=item["id"],
-                )
-                records.append(record)
+        # Remaining pages in parallel over the pooled session; results keep
+        # page order, and a failed page fails the whole listing
+        workers = min(self.LIST_PAGE_WORKERS, total_pages - 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for data in executor.map(fetch_page, range(2, total_pages + 1)):
+                records.extend(self._parse_records(data))
 
-            # Check pagination
-            result_info = data.get("result_info", {})
-            total_pages = result_info.get("total_pages", 1)
-            if page >= total_pages:
-                break
-            page += 1
+        return records
 
+    def _parse_records(self, data: dict[str, Any]) -> list[DNSRecord]:
+        """Convert one page of API results to DNSRecords"""
+        records: list[DNSRecord] = []
+        for item in data.get("result", []):
+            # Unfiltered zone listings include types we don't manage
+            # (NS, CAA, SRV, ...)
+            if item["type"] not in RecordType.__members__:
+                continue
+            record = DNSRecord(
+                name=item["name"],
+                type=RecordType(item["type"]),
+                content=item["content"],
+                ttl=item.get("ttl", 1),
+                priority=item.get("priority"),
+                proxied=item.get("proxied", False),
+                record_id=item["id"],
+            )
+            records.append(record)
         return records
 
-    def create_record(self, zone_id: str, record: DNSRecord) -> bool:
-        """Create a new DNS record"""
+    def _zone_write(
+        self,
+        zone_id: str,
+        method: str,
+        endpoint: str,
+        json_data: Optional[dict[str, Any]] = None,
+    ) -> dict[str, Any]:
+        """API request that changes a zone; drops the zone's cached listings"""
+        try:
+            return self._api_request(method, endpoint, json_data=json_data)
+        finally:
+            # Also on failure: the change may have been applied anyway
+            self.invalidate_records_cache(zone_id)
+
+    def _record_data(self, record: DNSRecord) -> dict[str, Any]:
+        """Build the API body for a record"""
         data: dict[str, Any] = {
             "type": record.type.value,
             "name": record.name,
@@ -226,71 +600,140 @@ class CloudflareProvider(DNSProvider):
         if record.type in (RecordType.A, RecordType.CNAME):
             data["proxied"] = self.cf_config.proxied and record.proxied
 
+        return data
+
+    def create_record(self, zone_id: str, record: DNSRecord) -> bool:
+        """Create a new DNS record"""
+        data = self._record_data(record)
+
         try:
-            result = self._api_request(
-                "POST", f"/zones/{zone_id}/dns_records", json_data=data
+            result = self._zone_write(
+                zone_id, "POST", f"/zones/{zone_id}/dns_records", data
             )
             record.record_id = result["result"]["id"]
-            self.logger.info(f"✓ Created {record.type.value} {record.name}")
+            self.logger.info("✓ Created %s %s", record.type.value, record.name)
             return True
         except CloudflareAPIError as e:
             self.logger.error(
-                f"✗ Failed to create {record.type.value} {record.name}: {e}"
+                "✗ Failed to create %s %s: %s", record.type.value, record.name, e
             )
             return False
 
     def update_record(self, zone_id: str, record: DNSRecord) -> bool:
         """Update an existing DNS record"""
         if not record.record_id:
-            self.logger.error(f"Cannot update record without record_id: {record.name}")
+            self.logger.error("Cannot update record without record_id: %s", record.name)
             return False
 
-        data: dict[str, Any] = {
-            "type": record.type.value,
-            "name": record.name,
-            "content": record.content,
-            "ttl": record.ttl if record.ttl > 1 else 1,
-        }
-
-        if record.type == RecordType.MX and record.priority is not None:
-            data["priority"] = record.priority
-
-        if record.type in (RecordType.A, RecordType.CNAME):
-            data["proxied"] = self.cf_config.proxied and record.proxied
+        data = self._record_data(record)
 
         try:
-            self._api_request(
-                "PUT",
-                f"/zones/{zone_id}/dns_records/{record.record_id}",
-                json_data=data,
+            self._zone_write(
+                zone_id, "PUT", f"/zones/{zone_id}/dns_records/{record.record_id}", data
             )
-            self.logger.info(f"✓ Updated {record.type.value} {record.name}")
+            self.logger.info("✓ Updated %s %s", record.type.value, record.name)
             return True
         except CloudflareAPIError as e:
             self.logger.error(
-                f"✗ Failed to update {record.type.value} {record.name}: {e}"
+                "✗ Failed to update %s %s: %s", record.type.value, record.name, e
             )
             return False
 
+    def apply_batch(
+        self,
+        zone_id: str,
+        creates: Optional[list[DNSRecord]] = None,
+        updates: Optional[list[DNSRecord]] = None,
+        deletes: Optional[list[str]] = None,
+    ) -> bool:
+        """
+        Apply several record changes in one request.
+
+        Uses the dns_records/batch endpoint, which applies deletes, then
+        updates, then creates, all or nothing. Created records get their
+        record_id set.
+
+        Args:
+            zone_id: Zone identifier
+            creates: Records to create
+            updates: Records to replace (record_id set)
+            deletes: Record IDs to delete
+
+        Returns:
+            True if the whole batch was applied
+        """
+        creates = creates or []
+        updates = updates or []
+        deletes = deletes or []
+
+        payload: dict[str, Any] = {
+            "deletes": [{"id": record_id} for record_id in deletes],
+            "puts": [{"id": r.record_id, **self._record_data(r)} for r in updates],
+            "posts": [self._record_data(r) for r in creates],
+        }
+
+        try:
+            result = self._zone_write(
+                zone_id, "POST", f"/zones/{zone_id}/dns_records/batch", payload
+            )
+        except CloudflareAPIError as e:
+            self.logger.error("✗ Failed to apply batch of DNS changes: %s", e)
+            return False
+
+        # Created records come back in request order
+        for record, item in zip(creates, result["result"].get("posts", [])):
+            record.record_id = item["id"]
+
+        for record in creates:
+            self.logger.info("✓ Created %s %s", record.type.value, record.name)
+        for record in updates:
+            self.logger.info("✓ Updated %s %s", record.type.value, record.name)
+        for record_id in deletes:
+            self.logger.info("✓ Deleted record %s", record_id)
+        return True
+
+    def create_records(self, zone_id: str, records: list[DNSRecord]) -> bool:
+        """Create several records with one batch request"""
+        if len(records) < 2:
+            return super().create_records(zone_id, records)
+        return self.apply_batch(zone_id, creates=records)
+
+    def delete_records(self, zone_id: str, record_ids: list[str]) -> bool:
+        """
+        Delete several records with one batch request.
+
+        The batch is all or nothing, so one stale ID would keep every other
+        record; if it fails, the records are deleted one by one instead.
+        """
+        if len(record_ids) > 1 and self.apply_batch(zone_id, deletes=record_ids):
+            return True
+        return super().delete_records(zone_id, record_ids)
+
     def delete_record(self, zone_id: str, record_id: str) -> bool:
         """Delete a DNS record"""
         try:
-            self._api_request("DELETE", f"/zones/{zone_id}/dns_records/{record_id}")
-            self.logger.info(f"✓ Deleted record {record_id}")
+            self._zone_write(
+                zone_id, "DELETE", f"/zones/{zone_id}/dns_records/{record_id}"
+            )
+            self.logger.info("✓ Deleted record %s", record_id)
             return True
         except CloudflareAPIError as e:
-            self.logger.error(f"✗ Failed to delete record {record_id}: {e}")
+            self.logger.error("✗ Failed to delete record %s: %s", record_id, e)
             return False
 
     def verify_credentials(self) -> bool:
         """Verify API token is valid"""
+        # The zone listing only succeeds with a working token
+        if self._zones_primed:
+            return True
+
         try:
             data = self._api_request("GET", "/user/tokens/verify")
             status = data.get("result", {}).get("status")
             if status == "active":
                 self.logger.info("Cloudflare API token verified")
                 return True
-            self.logger.error(f"Token status: {status}")
+            self.logger.error("Token status: %s", status)
             return False
         except CloudflareAPIError:
             return False
@@ -27,11 +27,9 @@ from pathlib import Path
 from types import FrameType
 from typing import Any, Optional
 
-# Add scripts directory to path
-sys.path.insert(0, str(Path(__file__).parent))
-
 from dns_providers.registry import get_provider_from_env
 from dns_manager import DNSManager, MailConfig
+from utils.files import write_atomic
 from utils.ip import IPDetector, IPDetectorConfig
 from utils.k8s import KubernetesClient, KubernetesConfig
 
@@ -105,12 +103,12 @@ def read_saved_state(shared_dir: Path) -> SavedState:
 def save_state(shared_dir: Path, state: SavedState) -> None:
     """Save state to shared volume"""
     state_file = shared_dir / "dns-state.json"
-    state_file.write_text(json.dumps(state.to_dict()))
+    write_atomic(state_file, json.dumps(state.to_dict()))
 
     # Also write legacy file for backward compatibility
     ip_file = shared_dir / "current-ip"
     if state.incoming_ip:
-        ip_file.write_text(state.incoming_ip)
+        write_atomic(ip_file, state.incoming_ip)
 
 
 def create_kill_marker(shared_dir: Path) -> None:
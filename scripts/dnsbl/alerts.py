@@ -2,26 +2,66 @@
 
 import logging
 import smtplib
-from datetime import datetime, timedelta, timezone
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from typing import Any
-
-import requests
+from typing import TYPE_CHECKING, Any
 
 from .config import BlacklistConfig
 from .models import BlacklistResult
 
+if TYPE_CHECKING:
+    import requests
+
 
 class AlertManager:
     """Manages email and webhook alerts."""
 
+    # Upper bound on remembered alerts (oldest are evicted first)
+    MAX_COOLDOWN_ENTRIES = 10_000
+
     def __init__(self, config: BlacklistConfig):
         self.config = config
         self.logger = logging.getLogger(__name__)
-        self._cooldown_cache: dict[
-            str, datetime
-        ] = {}  # "type:target:dnsbl" -> last alert time
+        # "type:target:dnsbl" -> last alert time (monotonic), oldest first
+        self._cooldown_cache: OrderedDict[str, float] = OrderedDict()
+        self._run_length: dict[str, int] = {}  # "type:target:dnsbl" -> listed streak
+
+        # Keep-alive session so alert bursts reuse one TLS connection,
+        # created with the first webhook
+        self._http: "requests.Session | None" = None
+
+    def _get_http(self) -> "requests.Session":
+        """Return the webhook session, importing requests on first use."""
+        if self._http is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            self._http = requests.Session()
+            # Only failed connects are retried: once the request is sent, the
+            # receiver may have processed it, and a resend would duplicate
+            # the alert
+            retry = Retry(
+                total=2,
+                connect=2,
+                read=0,
+                status=0,
+                other=0,
+                backoff_factor=0.2,
+                allowed_methods=["POST"],
+            )
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retry)
+            self._http.mount("https://", adapter)
+            self._http.mount("http://", adapter)
+        return self._http
+
+    @property
+    def _cooldown_seconds(self) -> float:
+        """Alert cooldown window in seconds."""
+        return self.config.alert_cooldown_hours * 3600
 
     def _should_alert(self, result: BlacklistResult) -> bool:
         """Check if we should send an alert (respecting cooldown)."""
@@ -31,13 +71,40 @@ class AlertManager:
         if last_alert is None:
             return True
 
-        cooldown = timedelta(hours=self.config.alert_cooldown_hours)
-        return datetime.now(timezone.utc) - last_alert > cooldown
+        return time.monotonic() - last_alert > self._cooldown_seconds
+
+    def _update_persistence(self, results: list[BlacklistResult]) -> None:
+        """Track consecutive listed checks per target/DNSBL combo."""
+        for r in results:
+            key = f"{r.target_type}:{r.target}:{r.dnsbl}"
+            if r.listed:
+                self._run_length[key] = self._run_length.get(key, 0) + 1
+            else:
+                # One clean check resets the streak
+                self._run_length.pop(key, None)
+
+    def _is_persistent(self, result: BlacklistResult) -> bool:
+        """Check if a listing has been seen in enough consecutive checks."""
+        key = f"{result.target_type}:{result.target}:{result.dnsbl}"
+        return self._run_length.get(key, 0) >= self.config.alert_persistence
 
     def _mark_alerted(self, result: BlacklistResult) -> None:
         """Mark that we've sent an alert for this target/DNSBL combo."""
         key = f"{result.target_type}:{result.target}:{result.dnsbl}"
-        self._cooldown_cache[key] = datetime.now(timezone.utc)
+        self._cooldown_cache[key] = time.monotonic()
+        self._cooldown_cache.move_to_end(key)
+        while len(self._cooldown_cache) > self.MAX_COOLDOWN_ENTRIES:
+            self._cooldown_cache.popitem(last=False)
+
+    def _purge_expired(self) -> None:
+        """Forget alerts whose cooldown has elapsed."""
+        cutoff = time.monotonic() - self._cooldown_seconds
+        # Entries are in alert order, so stop at the first one still active
+        while self._cooldown_cache:
+            key, last_alert = next(iter(self._cooldown_cache.items()))
+            if last_alert > cutoff:
+                break
+            del self._cooldown_cache[key]
 
     def send_alerts(
         self,
@@ -45,8 +112,15 @@ class AlertManager:
         domain_results: list[BlacklistResult],
     ) -> None:
         """Send all configured alerts for listed IPs/domains."""
-        ip_listed = [r for r in ip_results if r.listed]
-        domain_listed = [r for r in domain_results if r.listed]
+        self._purge_expired()
+        self._update_persistence(ip_results)
+        self._update_persistence(domain_results)
+
+        # Only listings that survived alert_persistence checks are reported
+        ip_listed = [r for r in ip_results if r.listed and self._is_persistent(r)]
+        domain_listed = [
+            r for r in domain_results if r.listed and self._is_persistent(r)
+        ]
 
         if not ip_listed and not domain_listed:
             return
@@ -128,10 +202,10 @@ class AlertManager:
             for r in ip_to_alert + domain_to_alert:
                 self._mark_alerted(r)
 
-            self.logger.info(f"Sent email alert to {self.config.alert_recipients}")
+            self.logger.info("Sent email alert to %s", self.config.alert_recipients)
 
         except Exception as e:
-            self.logger.error(f"Failed to send email alert: {e}")
+            self.logger.error("Failed to send email alert: %s", e)
 
     def _send_webhook_alert(
         self,
@@ -169,13 +243,13 @@ class AlertManager:
         }
 
         try:
-            response = requests.post(
+            response = self._get_http().post(
                 self.config.webhook_url,
                 json=payload,
                 timeout=self.config.webhook_timeout,
                 headers={"Content-Type": "application/json"},
             )
             response.raise_for_status()
-            self.logger.info(f"Sent webhook alert to {self.config.webhook_url}")
+            self.logger.info("Sent webhook alert to %s", self.config.webhook_url)
         except Exception as e:
-            self.logger.error(f"Failed to send webhook alert: {e}")
+            self.logger.error("Failed to send webhook alert: %s", e)
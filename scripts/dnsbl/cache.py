@@ -0,0 +1,66 @@
+"""In-process TTL cache for DNSBL lookup results."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Generic, Optional, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Bounded LRU cache with per-entry expiry.
+
+    Thread-safe: lookups run concurrently from the checker's worker pool.
+    Expired entries are dropped lazily on access; the least recently used
+    entry is evicted once maxsize is exceeded.
+    """
+
+    def __init__(self, maxsize: int = 16384):
+        self.maxsize = maxsize
+        self._data: OrderedDict[K, tuple[V, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K) -> tuple[bool, Optional[V]]:
+        """Return (hit, value); a miss or expired entry yields (False, None)."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False, None
+
+            value, expiry = entry
+            if time.monotonic() >= expiry:
+                del self._data[key]
+                return False, None
+
+            self._data.move_to_end(key)
+            return True, value
+
+    def set(self, key: K, value: V, ttl: float) -> None:
+        """Store value for ttl seconds (non-positive ttl is not cached)."""
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def purge_expired(self) -> int:
+        """Drop all expired entries, return how many were removed."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [k for k, (_, expiry) in self._data.items() if now >= expiry]
+            for key in expired:
+                del self._data[key]
+        return len(expired)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._data.clear()
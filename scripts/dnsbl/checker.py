@@ -1,39 +1,103 @@
 """Blacklist checker using DNSBL plugin system."""
 
 import logging
-from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 
-from .config import BlacklistConfig
+from .config import BlacklistConfig, split_csv
 from .models import BlacklistResult
-from .plugins import DnsblRegistry
+from .plugins import DnsblPlugin, DnsblRegistry
+from .plugins.base import HAS_DNSPYTHON
+from .plugins.services import needs_direct_query
 
 
 class BlacklistChecker:
     """Checks IPs and domains against DNSBL/URIBL lists using plugin system."""
 
-    def __init__(self, config: BlacklistConfig):
+    # Seconds between shutdown checks while lookups are in flight
+    SHUTDOWN_POLL_INTERVAL = 0.5
+
+    def __init__(
+        self,
+        config: BlacklistConfig,
+        shutdown_event: threading.Event | None = None,
+    ):
         self.config = config
+        self.shutdown_event = shutdown_event
         self.logger = logging.getLogger(__name__)
         self.registry = DnsblRegistry()
 
+        # Worker threads stay alive between check cycles
+        self._executor = ThreadPoolExecutor(
+            max_workers=config.concurrency, thread_name_prefix="dnsbl"
+        )
+
+        # Cached DNSBL answers expire well before the next cycle starts, so
+        # each cycle reports what the lists say now
+        DnsblPlugin.cache_max_ttl = config.interval // 2
+
+        # Custom DNS servers are shared by all plugins, sharded by zone
+        DnsblPlugin.custom_nameservers = split_csv(config.dns_server)
+        if config.dns_server and not HAS_DNSPYTHON:
+            self.logger.warning(
+                "dnspython not installed, ignoring custom DNS server %s",
+                config.dns_server,
+            )
+
         self.logger.info(
-            f"DNSBL plugin system loaded: {', '.join(self.registry.list_plugins())}"
+            "DNSBL plugin system loaded: %s", ", ".join(self.registry.list_plugins())
         )
 
         # Populate default lists from plugins if not specified
         if not self.config.lists:
             self.config.lists = self.registry.get_default_ip_lists()
             self.logger.info(
-                f"Using {len(self.config.lists)} default IP blacklists from plugins"
+                "Using %s default IP blacklists from plugins", len(self.config.lists)
             )
 
         if not self.config.domain_lists:
             self.config.domain_lists = self.registry.get_default_domain_lists()
             self.logger.info(
-                f"Using {len(self.config.domain_lists)} default domain blacklists from plugins"
+                "Using %s default domain blacklists from plugins",
+                len(self.config.domain_lists),
+            )
+
+        # Premium zones refuse public resolvers; without direct queries or a
+        # custom server every query to them is wasted on a refusal/timeout
+        can_query_premium = HAS_DNSPYTHON and bool(
+            config.dns_server or config.direct_query
+        )
+        if config.free_only or not can_query_premium:
+            self._skip_premium_zones(explicit=config.free_only)
+
+    def _skip_premium_zones(self, explicit: bool) -> None:
+        """Drop zones that only answer direct or private resolver queries."""
+        skipped = [
+            z
+            for z in self.config.lists + self.config.domain_lists
+            if needs_direct_query(z)
+        ]
+        if not skipped:
+            return
+
+        self.config.lists = [z for z in self.config.lists if z not in skipped]
+        self.config.domain_lists = [
+            z for z in self.config.domain_lists if z not in skipped
+        ]
+
+        message = f"Skipping {len(skipped)} premium DNSBL(s): {', '.join(skipped)}"
+        if explicit:
+            self.logger.info("%s (free-only mode)", message)
+        else:
+            self.logger.warning(
+                "%s (needs direct query via dnspython or a custom DNS server)", message
             )
 
-    def check_ip(self, ip: str, dnsbl: str) -> BlacklistResult:
+    def check_ip(
+        self, ip: str, dnsbl: str, check_time: datetime | None = None
+    ) -> BlacklistResult:
         """Check a single IP against a DNSBL."""
         result = self.registry.check_ip(
             ip, dnsbl, direct_query=self.config.direct_query
@@ -45,9 +109,12 @@ class BlacklistChecker:
             listed=result.listed,
             return_code=result.return_code or "",
             reason=result.reason or "",
+            check_time=check_time or datetime.now(timezone.utc),
         )
 
-    def check_domain(self, domain: str, dnsbl: str) -> BlacklistResult:
+    def check_domain(
+        self, domain: str, dnsbl: str, check_time: datetime | None = None
+    ) -> BlacklistResult:
         """Check a single domain against a URIBL/DBL."""
         result = self.registry.check_domain(
             domain, dnsbl, direct_query=self.config.direct_query
@@ -59,46 +126,109 @@ class BlacklistChecker:
             listed=result.listed,
             return_code=result.return_code or "",
             reason=result.reason or "",
+            check_time=check_time or datetime.now(timezone.utc),
         )
 
-    def check_all_ips(self, ip: str) -> list[BlacklistResult]:
-        """Check IP against all configured IP DNSBLs in parallel."""
-        results: list[BlacklistResult] = []
-
-        with ThreadPoolExecutor(max_workers=20) as executor:
-            futures: dict[Future[BlacklistResult], str] = {
-                executor.submit(self.check_ip, ip, dnsbl): dnsbl
-                for dnsbl in self.config.lists
-            }
+    def check_targets(
+        self, ips: list[str], domains: list[str]
+    ) -> tuple[dict[str, list[BlacklistResult]], dict[str, list[BlacklistResult]]]:
+        """Check IPs and domains against all configured lists in one fan-out.
+
+        Every (target, list) pair goes through a single worker pool, so wall
+        time is bound by the slowest zone rather than the number of targets.
+        At most `concurrency` checks are submitted at a time; the rest are
+        fed in as earlier ones complete.
+
+        Returns:
+            Tuple of (IP results, domain results), keyed by normalized target
+        """
+        # Keyed by normalized target so duplicates (e.g. "Example.com" and
+        # "example.com.") are only queried once per zone
+        ip_results: dict[str, list[BlacklistResult]] = {ip.strip(): [] for ip in ips}
+        domain_results: dict[str, list[BlacklistResult]] = {
+            d.lower().strip("."): [] for d in domains
+        }
+
+        pending: deque[tuple[str, str, str]] = deque(
+            ("ip", ip, dnsbl) for ip in ip_results for dnsbl in self.config.lists
+        )
+        pending.extend(
+            ("domain", domain, dnsbl)
+            for domain in domain_results
+            for dnsbl in self.config.domain_lists
+        )
 
-            for future in as_completed(futures):
-                try:
-                    results.append(future.result())
-                except Exception as e:
-                    dnsbl = futures[future]
-                    self.logger.warning(f"Failed to check {dnsbl}: {e}")
+        # All results of one cycle share a single timestamp
+        check_time = datetime.now(timezone.utc)
+
+        futures: dict[Future[BlacklistResult], tuple[str, str, str]] = {}
+        try:
+            while pending or futures:
+                if self.shutdown_event and self.shutdown_event.is_set():
+                    self.logger.info("Shutdown requested, abandoning pending checks")
+                    break
+
+                # Top up to the in-flight limit
+                while pending and len(futures) < self.config.concurrency:
+                    target_type, target, dnsbl = pending.popleft()
+                    if target_type == "ip":
+                        future = self._executor.submit(
+                            self.check_ip, target, dnsbl, check_time
+                        )
+                    else:
+                        future = self._executor.submit(
+                            self.check_domain, target, dnsbl, check_time
+                        )
+                    futures[future] = (target_type, target, dnsbl)
+
+                # Bounded wait, so a shutdown is noticed even while every
+                # in-flight lookup is stuck on a resolver timeout
+                done, _ = wait(
+                    futures,
+                    timeout=self.SHUTDOWN_POLL_INTERVAL,
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    target_type, target, dnsbl = futures.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        self.logger.warning(
+                            "Failed to check %s @ %s: %s", target, dnsbl, e
+                        )
+                        continue
+                    if target_type == "ip":
+                        ip_results[target].append(result)
+                    else:
+                        domain_results[target].append(result)
+        finally:
+            # Checks abandoned on shutdown are dropped instead of delaying it
+            for future in futures:
+                future.cancel()
+
+        return ip_results, domain_results
+
+    def close(self) -> None:
+        """Stop the worker pool without waiting for in-flight lookups."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def purge_cache(self) -> int:
+        """Drop expired lookup results, return the number of entries left."""
+        removed = DnsblPlugin.result_cache.purge_expired()
+        removed += DnsblPlugin.reason_cache.purge_expired()
+        if removed:
+            self.logger.debug("Purged %s expired DNSBL cache entries", removed)
+        return len(DnsblPlugin.result_cache)
 
-        return results
+    def check_all_ips(self, ip: str) -> list[BlacklistResult]:
+        """Check IP against all configured IP DNSBLs in parallel."""
+        ip_results, _ = self.check_targets([ip], [])
+        return ip_results[ip.strip()]
 
     def check_all_domains(self, domains: list[str]) -> list[BlacklistResult]:
         """Check domains against all configured domain blacklists in parallel."""
-        results: list[BlacklistResult] = []
-
-        with ThreadPoolExecutor(max_workers=20) as executor:
-            futures: dict[Future[BlacklistResult], tuple[str, str]] = {}
-            for domain in domains:
-                for dnsbl in self.config.domain_lists:
-                    future = executor.submit(self.check_domain, domain, dnsbl)
-                    futures[future] = (domain, dnsbl)
-
-            for future in as_completed(futures):
-                try:
-                    results.append(future.result())
-                except Exception as e:
-                    domain, dnsbl = futures[future]
-                    self.logger.warning(f"Failed to check {domain} @ {dnsbl}: {e}")
-
-        return results
+        _, domain_results = self.check_targets([], domains)
+        return [r for results in domain_results.values() for r in results]
 
     # Backward compatibility
     check_single = check_ip
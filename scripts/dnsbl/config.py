@@ -1,8 +1,27 @@
 """Configuration for blacklist monitoring."""
 
 import os
+import re
 from dataclasses import dataclass, field
 
+# Separators for list values: commas and/or whitespace
+_CSV_RE = re.compile(r"[,\s]+")
+
+
+def split_csv(value: str) -> list[str]:
+    """Split a comma/whitespace separated list into non-empty tokens."""
+    return [token for token in _CSV_RE.split(value) if token]
+
+
+def _env_list(name: str) -> list[str]:
+    """Read a comma/whitespace separated list from the environment."""
+    return split_csv(os.environ.get(name, ""))
+
+
+def _env_bool(name: str, default: str = "false") -> bool:
+    """Read a "true"/"false" flag from the environment."""
+    return os.environ.get(name, default).lower() == "true"
+
 
 @dataclass
 class BlacklistConfig:
@@ -11,13 +30,20 @@ class BlacklistConfig:
     interval: int = 3600  # Check interval in seconds
     metrics_port: int = 8095
 
-    # Custom DNS server (optional, plugins handle direct queries)
+    # Custom recursive DNS server(s), comma-separated (optional)
+    # Takes precedence over direct queries when set
     dns_server: str = ""
 
+    # Maximum DNSBL queries in flight (too high can overwhelm a single resolver)
+    concurrency: int = 128
+
     # Direct query mode - query authoritative NS servers directly
     # This bypasses public resolvers and works with premium DNSBLs
     direct_query: bool = True
 
+    # Only check DNSBLs that answer public resolvers
+    free_only: bool = False
+
     # IP-based DNSBL lists to check
     lists: list[str] = field(default_factory=list)
 
@@ -33,6 +59,7 @@ class BlacklistConfig:
     alert_from: str = ""
     alert_subject_prefix: str = "[BLACKLIST ALERT]"
     alert_cooldown_hours: int = 24
+    alert_persistence: int = 2  # Consecutive listed checks before alerting
     alert_smtp_host: str = "localhost"
     alert_smtp_port: int = 25
 
@@ -48,55 +75,28 @@ class BlacklistConfig:
     def from_env(cls) -> "BlacklistConfig":
         """Create config from environment variables."""
         # IP blacklists - will be populated from registry if empty
-        lists_env = os.environ.get("BLACKLIST_LISTS", "")
-        lists = (
-            [x.strip() for x in lists_env.split(",") if x.strip()] if lists_env else []
-        )
-
-        custom_lists = os.environ.get("BLACKLIST_CUSTOM_LISTS", "")
-        if custom_lists:
-            lists.extend([x.strip() for x in custom_lists.split(",") if x.strip()])
+        lists = _env_list("BLACKLIST_LISTS") + _env_list("BLACKLIST_CUSTOM_LISTS")
 
         # Domain blacklists - will be populated from registry if empty
-        domain_lists_env = os.environ.get("BLACKLIST_DOMAIN_LISTS", "")
-        domain_lists = (
-            [x.strip() for x in domain_lists_env.split(",") if x.strip()]
-            if domain_lists_env
-            else []
-        )
-
-        custom_domain_lists = os.environ.get("BLACKLIST_CUSTOM_DOMAIN_LISTS", "")
-        if custom_domain_lists:
-            domain_lists.extend(
-                [x.strip() for x in custom_domain_lists.split(",") if x.strip()]
-            )
-
-        # Domains to check
-        domains_env = os.environ.get("BLACKLIST_DOMAINS", "")
-        domains = (
-            [d.strip() for d in domains_env.split(",") if d.strip()]
-            if domains_env
-            else []
+        domain_lists = _env_list("BLACKLIST_DOMAIN_LISTS") + _env_list(
+            "BLACKLIST_CUSTOM_DOMAIN_LISTS"
         )
 
+        # Recipients may carry display names, so only split on commas
         recipients_env = os.environ.get("BLACKLIST_ALERT_RECIPIENTS", "")
-        recipients = (
-            [r.strip() for r in recipients_env.split(",") if r.strip()]
-            if recipients_env
-            else []
-        )
+        recipients = [r.strip() for r in recipients_env.split(",") if r.strip()]
 
         return cls(
             interval=int(os.environ.get("BLACKLIST_INTERVAL", "3600")),
             metrics_port=int(os.environ.get("BLACKLIST_METRICS_PORT", "8095")),
             dns_server=os.environ.get("BLACKLIST_DNS_SERVER", ""),
-            direct_query=os.environ.get("BLACKLIST_DIRECT_QUERY", "true").lower()
-            == "true",
+            concurrency=max(1, int(os.environ.get("BLACKLIST_CONCURRENCY", "128"))),
+            direct_query=_env_bool("BLACKLIST_DIRECT_QUERY", "true"),
+            free_only=_env_bool("BLACKLIST_FREE_ONLY"),
             lists=lists,
             domain_lists=domain_lists,
-            domains=domains,
-            alert_enabled=os.environ.get("BLACKLIST_ALERT_ENABLED", "false").lower()
-            == "true",
+            domains=_env_list("BLACKLIST_DOMAINS"),
+            alert_enabled=_env_bool("BLACKLIST_ALERT_ENABLED"),
             alert_recipients=recipients,
             alert_from=os.environ.get("BLACKLIST_ALERT_FROM", ""),
             alert_subject_prefix=os.environ.get(
@@ -105,10 +105,10 @@ class BlacklistConfig:
             alert_cooldown_hours=int(
                 os.environ.get("BLACKLIST_ALERT_COOLDOWN_HOURS", "24")
             ),
+            alert_persistence=int(os.environ.get("BLACKLIST_ALERT_PERSISTENCE", "2")),
             alert_smtp_host=os.environ.get("BLACKLIST_ALERT_SMTP_HOST", "localhost"),
             alert_smtp_port=int(os.environ.get("BLACKLIST_ALERT_SMTP_PORT", "25")),
-            webhook_enabled=os.environ.get("BLACKLIST_WEBHOOK_ENABLED", "false").lower()
-            == "true",
+            webhook_enabled=_env_bool("BLACKLIST_WEBHOOK_ENABLED"),
             webhook_url=os.environ.get("BLACKLIST_WEBHOOK_URL", ""),
             webhook_timeout=int(os.environ.get("BLACKLIST_WEBHOOK_TIMEOUT", "5")),
             shared_dir=os.environ.get("SHARED_DIR", "/shared"),
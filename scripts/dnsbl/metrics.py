@@ -1,10 +1,14 @@
 """Prometheus metrics server for blacklist monitoring."""
 
 import threading
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 from .models import BlacklistResult
 
+# Prometheus label value escapes: backslash, double quote and newline
+_LABEL_ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": "\\n"})
+
 
 class MetricsHandler(BaseHTTPRequestHandler):
     """HTTP handler for Prometheus metrics endpoint."""
@@ -13,7 +17,14 @@ class MetricsHandler(BaseHTTPRequestHandler):
     ip_results: list[BlacklistResult] = []
     domain_results: list[BlacklistResult] = []
     check_count: int = 0
-    listing_events: dict[str, int] = {}  # "type:target:dnsbl" -> count
+    cache_size: int = 0
+    # (target_type, target, dnsbl) -> count
+    listing_events: Counter[tuple[str, str, str]] = Counter()
+
+    # Rendered once per check cycle; results only change when a check completes.
+    # Published with a single assignment, so a scrape sees one whole snapshot
+    # and never a mix of two cycles' results
+    payload: bytes = b""
 
     def log_message(self, format: str, *args: object) -> None:
         """Suppress default HTTP logging."""
@@ -43,10 +54,21 @@ class MetricsHandler(BaseHTTPRequestHandler):
     @staticmethod
     def _escape_label_value(value: str) -> str:
         """Escape special characters in Prometheus label values."""
-        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        return value.translate(_LABEL_ESCAPES)
 
     def _send_metrics(self) -> None:
+        """Serve the Prometheus metrics rendered for the last check."""
+        payload = self.payload
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    @classmethod
+    def render(cls) -> bytes:
         """Generate Prometheus metrics."""
+        esc = cls._escape_label_value
         lines: list[str] = []
 
         # IP blacklist status
@@ -54,12 +76,10 @@ class MetricsHandler(BaseHTTPRequestHandler):
             "# HELP mail_relay_blacklist_status IP blacklist status (1=listed, 0=clean)"
         )
         lines.append("# TYPE mail_relay_blacklist_status gauge")
-        for result in self.ip_results:
-            status = 1 if result.listed else 0
-            reason = self._escape_label_value(result.reason) if result.reason else ""
-            lines.append(
-                f'mail_relay_blacklist_status{{ip="{result.target}",list="{result.dnsbl}",reason="{reason}"}} {status}'
-            )
+        lines.extend(
+            f'mail_relay_blacklist_status{{ip="{esc(r.target)}",list="{esc(r.dnsbl)}",reason="{esc(r.reason)}"}} {int(r.listed)}'
+            for r in cls.ip_results
+        )
 
         # Domain blacklist status
         lines.append("")
@@ -67,12 +87,10 @@ class MetricsHandler(BaseHTTPRequestHandler):
             "# HELP mail_relay_domain_blacklist_status Domain blacklist status (1=listed, 0=clean)"
         )
         lines.append("# TYPE mail_relay_domain_blacklist_status gauge")
-        for result in self.domain_results:
-            status = 1 if result.listed else 0
-            reason = self._escape_label_value(result.reason) if result.reason else ""
-            lines.append(
-                f'mail_relay_domain_blacklist_status{{domain="{result.target}",list="{result.dnsbl}",reason="{reason}"}} {status}'
-            )
+        lines.extend(
+            f'mail_relay_domain_blacklist_status{{domain="{esc(r.target)}",list="{esc(r.dnsbl)}",reason="{esc(r.reason)}"}} {int(r.listed)}'
+            for r in cls.domain_results
+        )
 
         # Total checks
         lines.append("")
@@ -80,7 +98,15 @@ class MetricsHandler(BaseHTTPRequestHandler):
             "# HELP mail_relay_blacklist_checks_total Total number of blacklist checks performed"
         )
         lines.append("# TYPE mail_relay_blacklist_checks_total counter")
-        lines.append(f"mail_relay_blacklist_checks_total {self.check_count}")
+        lines.append(f"mail_relay_blacklist_checks_total {cls.check_count}")
+
+        # DNS result cache
+        lines.append("")
+        lines.append(
+            "# HELP mail_relay_blacklist_dns_cache_entries Number of cached DNSBL lookup results"
+        )
+        lines.append("# TYPE mail_relay_blacklist_dns_cache_entries gauge")
+        lines.append(f"mail_relay_blacklist_dns_cache_entries {cls.cache_size}")
 
         # Listing events
         lines.append("")
@@ -88,18 +114,16 @@ class MetricsHandler(BaseHTTPRequestHandler):
             "# HELP mail_relay_blacklist_listed_total Total times target was found on a blacklist"
         )
         lines.append("# TYPE mail_relay_blacklist_listed_total counter")
-        for key, count in self.listing_events.items():
-            parts = key.split(":", 2)
-            if len(parts) == 3:
-                target_type, target, dnsbl = parts
-                if target_type == "ip":
-                    lines.append(
-                        f'mail_relay_blacklist_listed_total{{ip="{target}",list="{dnsbl}"}} {count}'
-                    )
-                else:
-                    lines.append(
-                        f'mail_relay_blacklist_listed_total{{domain="{target}",list="{dnsbl}"}} {count}'
-                    )
+        for (target_type, target, dnsbl), count in cls.listing_events.items():
+            target, dnsbl = esc(target), esc(dnsbl)
+            if target_type == "ip":
+                lines.append(
+                    f'mail_relay_blacklist_listed_total{{ip="{target}",list="{dnsbl}"}} {count}'
+                )
+            else:
+                lines.append(
+                    f'mail_relay_blacklist_listed_total{{domain="{target}",list="{dnsbl}"}} {count}'
+                )
 
         # Summary counts
         lines.append("")
@@ -107,10 +131,10 @@ class MetricsHandler(BaseHTTPRequestHandler):
             "# HELP mail_relay_blacklist_ip_listed_count Number of IP blacklists where IP is listed"
         )
         lines.append("# TYPE mail_relay_blacklist_ip_listed_count gauge")
-        ip_listed = sum(1 for r in self.ip_results if r.listed)
-        if self.ip_results:
+        ip_listed = sum(1 for r in cls.ip_results if r.listed)
+        if cls.ip_results:
             lines.append(
-                f'mail_relay_blacklist_ip_listed_count{{ip="{self.ip_results[0].target}"}} {ip_listed}'
+                f'mail_relay_blacklist_ip_listed_count{{ip="{esc(cls.ip_results[0].target)}"}} {ip_listed}'
             )
 
         lines.append("")
@@ -118,18 +142,12 @@ class MetricsHandler(BaseHTTPRequestHandler):
             "# HELP mail_relay_blacklist_domain_listed_count Number of domain blacklists where domain is listed"
         )
         lines.append("# TYPE mail_relay_blacklist_domain_listed_count gauge")
-        domains_seen: set[str] = set()
-        for result in self.domain_results:
-            if result.target not in domains_seen:
-                domain_listed = sum(
-                    1
-                    for r in self.domain_results
-                    if r.target == result.target and r.listed
-                )
-                lines.append(
-                    f'mail_relay_blacklist_domain_listed_count{{domain="{result.target}"}} {domain_listed}'
-                )
-                domains_seen.add(result.target)
+        # One pass instead of rescanning all results per domain
+        domain_listed = Counter(r.target for r in cls.domain_results if r.listed)
+        lines.extend(
+            f'mail_relay_blacklist_domain_listed_count{{domain="{esc(domain)}"}} {domain_listed[domain]}'
+            for domain in dict.fromkeys(r.target for r in cls.domain_results)
+        )
 
         # Last check timestamp
         lines.append("")
@@ -137,63 +155,59 @@ class MetricsHandler(BaseHTTPRequestHandler):
             "# HELP mail_relay_blacklist_last_check_timestamp Unix timestamp of last check"
         )
         lines.append("# TYPE mail_relay_blacklist_last_check_timestamp gauge")
-        all_results = self.ip_results + self.domain_results
+        all_results = cls.ip_results + cls.domain_results
         if all_results:
             ts = int(all_results[0].check_time.timestamp())
             lines.append(f"mail_relay_blacklist_last_check_timestamp {ts}")
 
-        content = "\n".join(lines) + "\n"
-        self.send_response(200)
-        self.send_header("Content-Type", "text/plain; charset=utf-8")
-        self.end_headers()
-        self.wfile.write(content.encode())
+        return ("\n".join(lines) + "\n").encode()
 
 
 class MetricsServer:
     """Prometheus metrics server."""
 
-    def __init__(self, port: int, shutdown_event: threading.Event):
+    def __init__(self, port: int):
         self.port = port
-        self.shutdown_event = shutdown_event
-        self.server: HTTPServer | None = None
+        self.server: ThreadingHTTPServer | None = None
         self._thread: threading.Thread | None = None
 
     def start(self) -> None:
         """Start the metrics server in a background thread."""
-        self.server = HTTPServer(("0.0.0.0", self.port), MetricsHandler)
-        self.server.timeout = 1
-
-        self._thread = threading.Thread(target=self._run, daemon=True)
+        # Scrapes before the first check completes get the empty snapshot
+        MetricsHandler.payload = MetricsHandler.render()
+
+        # One thread per request so a slow scrape never blocks /health probes
+        self.server = ThreadingHTTPServer(("0.0.0.0", self.port), MetricsHandler)
+
+        # Requests wake the serve loop immediately; it is never shut down
+        # explicitly (daemon thread ends with the process), so the poll
+        # interval only sets how often an idle server wakes up
+        self._thread = threading.Thread(
+            target=self.server.serve_forever,
+            kwargs={"poll_interval": 60},
+            daemon=True,
+        )
         self._thread.start()
 
-    def _run(self) -> None:
-        """Run the server until shutdown."""
-        while not self.shutdown_event.is_set():
-            if self.server:
-                self.server.handle_request()
-
     def update_results(
         self,
         ip_results: list[BlacklistResult],
         domain_results: list[BlacklistResult],
         check_count: int,
+        cache_size: int = 0,
     ) -> None:
         """Update metrics with new results."""
         MetricsHandler.ip_results = ip_results
         MetricsHandler.domain_results = domain_results
         MetricsHandler.check_count = check_count
+        MetricsHandler.cache_size = cache_size
 
         # Track listing events
-        for r in ip_results:
-            if r.listed:
-                key = f"ip:{r.target}:{r.dnsbl}"
-                MetricsHandler.listing_events[key] = (
-                    MetricsHandler.listing_events.get(key, 0) + 1
-                )
+        MetricsHandler.listing_events.update(
+            (r.target_type, r.target, r.dnsbl)
+            for r in ip_results + domain_results
+            if r.listed
+        )
 
-        for r in domain_results:
-            if r.listed:
-                key = f"domain:{r.target}:{r.dnsbl}"
-                MetricsHandler.listing_events[key] = (
-                    MetricsHandler.listing_events.get(key, 0) + 1
-                )
+        # Render once per check instead of on every scrape
+        MetricsHandler.payload = MetricsHandler.render()
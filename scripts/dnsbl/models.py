@@ -4,7 +4,7 @@ from dataclasses import dataclass, field
 from datetime import datetime, timezone
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BlacklistResult:
     """Result of a DNSBL check."""
 
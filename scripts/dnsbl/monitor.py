@@ -4,9 +4,10 @@ import json
 import logging
 import os
 import threading
+import time
+from collections.abc import Callable
 from pathlib import Path
-
-import requests
+from typing import TYPE_CHECKING
 
 from .alerts import AlertManager
 from .checker import BlacklistChecker
@@ -14,62 +15,98 @@ from .config import BlacklistConfig
 from .metrics import MetricsServer
 from .models import BlacklistResult
 
+if TYPE_CHECKING:
+    import requests
+
 
 class BlacklistMonitor:
     """Main blacklist monitoring service."""
 
+    # External APIs for IP auto-detection
+    IP_APIS = (
+        "https://ifconfig.me/ip",
+        "https://icanhazip.com",
+        "https://api.ipify.org",
+    )
+
+    # How long an auto-detected IP is trusted before the APIs are asked again
+    EXTERNAL_IP_MAX_AGE = 6 * 3600
+
     def __init__(self, config: BlacklistConfig, shutdown_event: threading.Event):
         self.config = config
         self.shutdown_event = shutdown_event
         self.logger = logging.getLogger(__name__)
 
-        self.checker = BlacklistChecker(config)
+        self.checker = BlacklistChecker(config, shutdown_event)
         self.alerts = AlertManager(config)
-        self.metrics = MetricsServer(config.metrics_port, shutdown_event)
+        self.metrics = MetricsServer(config.metrics_port)
 
         self._check_count = 0
         self._current_ip: str | None = None
 
+        # Shared IP files: path -> ((mtime_ns, size), parsed IP)
+        self._file_cache: dict[Path, tuple[tuple[int, int], str]] = {}
+
+        # Keep-alive session for IP auto-detection, created on first use;
+        # the last API that answered is tried first so its connection gets reused
+        self._ip_apis = list(self.IP_APIS)
+        self._http: "requests.Session | None" = None
+        self._external_ip: str | None = None
+        self._external_ip_at = 0.0  # monotonic time of last API answer
+
     def start(self) -> None:
         """Start the monitoring service."""
-        self.logger.info("=" * 50)
-        self.logger.info("Blacklist Monitor Starting")
-        self.logger.info("=" * 50)
-        self.logger.info(f"Check interval: {self.config.interval}s")
-        self.logger.info(f"Metrics port: {self.config.metrics_port}")
-        self.logger.info(f"Direct query: {self.config.direct_query}")
-        self.logger.info(f"IP DNSBLs: {len(self.config.lists)}")
-        self.logger.info(f"Domain DBLs: {len(self.config.domain_lists)}")
+        # One record (one write) for the whole banner, so it stays together
+        # when several containers log to the same collector
+        banner = [
+            "=" * 50,
+            "Blacklist Monitor Starting",
+            "=" * 50,
+            f"Check interval: {self.config.interval}s",
+            f"Metrics port: {self.config.metrics_port}",
+            f"Direct query: {self.config.direct_query}",
+            f"IP DNSBLs: {len(self.config.lists)}",
+            f"Domain DBLs: {len(self.config.domain_lists)}",
+        ]
         if self.config.domains:
-            self.logger.info(f"Domains to check: {', '.join(self.config.domains)}")
-        self.logger.info("")
+            banner.append(f"Domains to check: {', '.join(self.config.domains)}")
+        banner.append("")
+        self.logger.info("\n".join(banner))
 
         # Start metrics server
         self.metrics.start()
-        self.logger.info(f"Metrics server started on port {self.config.metrics_port}")
+        self.logger.info("Metrics server started on port %s", self.config.metrics_port)
 
-        # Wait for IP
-        self._current_ip = self._wait_for_ip()
-        if not self._current_ip:
-            return
+        try:
+            # Wait for IP
+            self._current_ip = self._wait_for_ip()
+            if not self._current_ip:
+                return
 
-        self.logger.info(f"Monitoring IP: {self._current_ip}")
-        if self.config.domains:
-            self.logger.info(f"Monitoring domains: {', '.join(self.config.domains)}")
-        self.logger.info("")
+            self.logger.info("Monitoring IP: %s", self._current_ip)
+            if self.config.domains:
+                self.logger.info(
+                    "Monitoring domains: %s", ", ".join(self.config.domains)
+                )
+            self.logger.info("")
 
-        # Main loop
-        self._run_loop()
+            # Main loop
+            self._run_loop()
+        finally:
+            self.checker.close()
 
         self.logger.info("Blacklist Monitor stopped")
 
     def _run_loop(self) -> None:
         """Main monitoring loop."""
         while not self.shutdown_event.is_set():
+            # Cycles start every `interval` seconds regardless of check time
+            deadline = time.monotonic() + self.config.interval
+
             # Check for IP changes
             new_ip = self._detect_ip()
             if new_ip and new_ip != self._current_ip:
-                self.logger.info(f"IP changed: {self._current_ip} -> {new_ip}")
+                self.logger.info("IP changed: %s -> %s", self._current_ip, new_ip)
                 self._current_ip = new_ip
 
             if not self._current_ip:
@@ -79,59 +116,84 @@ class BlacklistMonitor:
 
             # Run checks
             ip_results, domain_results = self._run_check()
+            if self.shutdown_event.is_set():
+                # Results of an interrupted check are incomplete
+                break
 
             # Update metrics
-            self.metrics.update_results(ip_results, domain_results, self._check_count)
+            cache_size = self.checker.purge_cache()
+            self.metrics.update_results(
+                ip_results, domain_results, self._check_count, cache_size
+            )
 
             # Send alerts
             self.alerts.send_alerts(ip_results, domain_results)
 
-            # Wait for next check
-            self.shutdown_event.wait(self.config.interval)
+            # Wait for next check; a cycle that overran starts the next at once
+            remaining = deadline - time.monotonic()
+            if remaining > 0:
+                self.shutdown_event.wait(remaining)
 
     def _run_check(self) -> tuple[list[BlacklistResult], list[BlacklistResult]]:
         """Run a single check cycle."""
         self._check_count += 1
 
-        # Check IP
+        ip = (self._current_ip or "").strip()
+        domains: list[str] = []
+        if self.config.domains and self.config.domain_lists:
+            domains = self.config.domains
+
         self.logger.info(
-            f"Checking IP {self._current_ip} against {len(self.config.lists)} DNSBLs..."
+            "Checking IP %s against %s DNSBLs...", ip, len(self.config.lists)
         )
-        ip_results = self.checker.check_all_ips(self._current_ip or "")
+        if domains:
+            self.logger.info(
+                "Checking %s domain(s) against %s DBLs...",
+                len(domains),
+                len(self.config.domain_lists),
+            )
+
+        # IP and domain lookups run in one fan-out, not one after the other
+        ip_by_target, domain_by_target = self.checker.check_targets([ip], domains)
+        ip_results = ip_by_target[ip]
 
+        # Report IP
         ip_listed = [r for r in ip_results if r.listed]
         ip_clean = len(ip_results) - len(ip_listed)
 
         if ip_listed:
             self.logger.warning(
-                f"IP LISTED on {len(ip_listed)} blacklist(s), clean on {ip_clean}"
+                "IP LISTED on %s blacklist(s), clean on %s", len(ip_listed), ip_clean
             )
             for r in ip_listed:
-                self.logger.warning(f"  - {r.dnsbl}: {r.return_code} {r.reason or ''}")
+                self.logger.warning(
+                    "  - %s: %s %s", r.dnsbl, r.return_code, r.reason or ""
+                )
         else:
-            self.logger.info(f"IP clean on all {len(ip_results)} blacklists")
-
-        # Check domains
-        domain_results: list[BlacklistResult] = []
-        if self.config.domains and self.config.domain_lists:
-            self.logger.info(
-                f"Checking {len(self.config.domains)} domain(s) against {len(self.config.domain_lists)} DBLs..."
-            )
-            domain_results = self.checker.check_all_domains(self.config.domains)
+            self.logger.info("IP clean on all %s blacklists", len(ip_results))
 
+        # Report domains
+        domain_results = [r for results in domain_by_target.values() for r in results]
+        if domains:
             domain_listed = [r for r in domain_results if r.listed]
             domain_clean = len(domain_results) - len(domain_listed)
 
             if domain_listed:
                 self.logger.warning(
-                    f"DOMAIN(S) LISTED on {len(domain_listed)} blacklist(s), clean on {domain_clean}"
+                    "DOMAIN(S) LISTED on %s blacklist(s), clean on %s",
+                    len(domain_listed),
+                    domain_clean,
                 )
                 for r in domain_listed:
                     self.logger.warning(
-                        f"  - {r.target} @ {r.dnsbl}: {r.return_code} {r.reason or ''}"
+                        "  - %s @ %s: %s %s",
+                        r.target,
+                        r.dnsbl,
+                        r.return_code,
+                        r.reason or "",
                     )
             else:
-                self.logger.info(f"Domains clean on all {len(domain_results)} checks")
+                self.logger.info("Domains clean on all %s checks", len(domain_results))
 
         return ip_results, domain_results
 
@@ -155,100 +217,160 @@ class BlacklistMonitor:
         return None
 
     def _detect_ip(self) -> str | None:
-        """Detect current IP from shared volume or external API."""
+        """Detect current IP from shared volume or external API.
+
+        The shared files and BLACKLIST_STATIC_IP are checked every call;
+        they cost a stat() at most. External APIs are only asked when
+        neither is available and the last auto-detected IP is older than
+        EXTERNAL_IP_MAX_AGE.
+        """
+        ip = self._read_shared_ip()
+        if ip:
+            return ip
+
+        age = time.monotonic() - self._external_ip_at
+        if self._external_ip and age < self.EXTERNAL_IP_MAX_AGE:
+            return self._external_ip
+
+        ip = self._detect_ip_external()
+        if ip:
+            self._external_ip = ip
+            self._external_ip_at = time.monotonic()
+        return ip
+
+    def _read_shared_ip(self) -> str | None:
+        """Read IP from shared volume or environment (no network)."""
         shared_dir = Path(self.config.shared_dir)
 
         # Try dns-state.json first
-        state_file = shared_dir / "dns-state.json"
-        if state_file.exists():
-            try:
-                data: dict[str, str] = json.loads(state_file.read_text())
-                ip = data.get("outbound_ip") or data.get("incoming_ip") or ""
-                if ip:
-                    return ip
-            except (json.JSONDecodeError, KeyError):
-                pass
+        ip = self._read_ip_file(shared_dir / "dns-state.json", self._parse_state)
+        if ip:
+            return ip
 
         # Legacy format
-        ip_file = shared_dir / "current-ip"
-        if ip_file.exists():
-            ip = ip_file.read_text().strip()
-            if ip:
-                return ip
+        ip = self._read_ip_file(
+            shared_dir / "current-ip", lambda data: data.decode().strip()
+        )
+        if ip:
+            return ip
 
         # Static IP from environment
         static_ip = os.environ.get("BLACKLIST_STATIC_IP", "")
         if static_ip:
             return static_ip
 
-        # Auto-detect via external API
-        for api in [
-            "https://ifconfig.me/ip",
-            "https://icanhazip.com",
-            "https://api.ipify.org",
-        ]:
+        return None
+
+    def _get_http(self) -> "requests.Session":
+        """Return the IP detection session, creating it on first use.
+
+        requests is only imported here: with a shared state file or a static
+        IP the monitor never talks HTTP, and check-once runs skip it too.
+        """
+        if self._http is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            self._http = requests.Session()
+            retry = Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+            self._http.mount(
+                "https://",
+                HTTPAdapter(pool_connections=3, pool_maxsize=3, max_retries=retry),
+            )
+        return self._http
+
+    def _detect_ip_external(self) -> str | None:
+        """Auto-detect IP via external API."""
+        http = self._get_http()
+        for api in self._ip_apis:
             try:
-                response = requests.get(api, timeout=5)
-                if response.status_code == 200:
-                    ip = response.text.strip()
+                # The body is a bare IP: read a capped amount of raw bytes
+                # instead of buffering it and guessing its charset
+                with http.get(api, timeout=(2, 3), stream=True) as response:
+                    if response.status_code != 200:
+                        continue
+                    body = response.raw.read(64, decode_content=True)
+                    ip = body.strip().decode("ascii", "ignore")
                     if ip:
-                        self.logger.info(f"Auto-detected IP via {api}: {ip}")
+                        self.logger.info("Auto-detected IP via %s: %s", api, ip)
+                        if api != self._ip_apis[0]:
+                            self._ip_apis.remove(api)
+                            self._ip_apis.insert(0, api)
                         return ip
             except Exception:
                 continue
 
         return None
 
+    @staticmethod
+    def _parse_state(data: bytes) -> str:
+        """Extract the IP from dns-state.json contents."""
+        state: dict[str, str] = json.loads(data)
+        return state.get("outbound_ip") or state.get("incoming_ip") or ""
+
+    def _read_ip_file(self, path: Path, parse: Callable[[bytes], str]) -> str:
+        """Read an IP from a shared file, reparsing only when it changed."""
+        try:
+            st = path.stat()
+        except OSError:
+            return ""
+
+        version = (st.st_mtime_ns, st.st_size)
+        cached = self._file_cache.get(path)
+        if cached and cached[0] == version:
+            return cached[1]
+
+        try:
+            ip = parse(path.read_bytes())
+        except (OSError, ValueError, KeyError):
+            # Missing or half-written; retry on the next call
+            return ""
+
+        self._file_cache[path] = (version, ip)
+        return ip
+
     def check_once(self, ips: list[str], domains: list[str]) -> int:
         """Run a single check and return exit code (for testing)."""
-        total_listed = 0
+        try:
+            ip_results, domain_results = self.checker.check_targets(ips, domains)
+        finally:
+            self.checker.close()
 
-        for ip in ips:
-            self.logger.info(f"\n{'=' * 60}")
-            self.logger.info(f"Checking IP: {ip}")
-            self.logger.info(f"{'=' * 60}")
-
-            results = self.checker.check_all_ips(ip)
-            listed = [r for r in results if r.listed]
-            clean = len(results) - len(listed)
+        total_listed = 0
+        for ip, results in ip_results.items():
+            total_listed += self._report_target("IP", ip, results)
+        for domain, results in domain_results.items():
+            total_listed += self._report_target("domain", domain, results)
 
-            if listed:
-                self.logger.warning(
-                    f"⚠️  LISTED on {len(listed)} blacklist(s), clean on {clean}"
-                )
-                for r in listed:
-                    self.logger.warning(
-                        f"  ❌ {r.dnsbl}: {r.return_code} {r.reason or ''}"
-                    )
-                total_listed += len(listed)
-            else:
-                self.logger.info(f"✅ Clean on all {len(results)} blacklists")
+        self.logger.info("\n" + "=" * 60)
+        if total_listed > 0:
+            self.logger.warning("SUMMARY: Found %s listing(s)", total_listed)
+            return 1
+        else:
+            self.logger.info("SUMMARY: All targets clean!")
+            return 0
 
-        for domain in domains:
-            self.logger.info(f"\n{'=' * 60}")
-            self.logger.info(f"Checking domain: {domain}")
-            self.logger.info(f"{'=' * 60}")
+    def _report_target(
+        self, label: str, target: str, results: list[BlacklistResult]
+    ) -> int:
+        """Log check-once results for a single target, return listing count."""
+        self.logger.info("\n" + "=" * 60)
+        self.logger.info("Checking %s: %s", label, target)
+        self.logger.info("=" * 60)
 
-            results = self.checker.check_all_domains([domain])
-            listed = [r for r in results if r.listed]
-            clean = len(results) - len(listed)
+        listed = [r for r in results if r.listed]
+        clean = len(results) - len(listed)
 
-            if listed:
+        if listed:
+            self.logger.warning(
+                "⚠️  LISTED on %s blacklist(s), clean on %s", len(listed), clean
+            )
+            for r in listed:
                 self.logger.warning(
-                    f"⚠️  LISTED on {len(listed)} blacklist(s), clean on {clean}"
+                    "  ❌ %s: %s %s", r.dnsbl, r.return_code, r.reason or ""
                 )
-                for r in listed:
-                    self.logger.warning(
-                        f"  ❌ {r.dnsbl}: {r.return_code} {r.reason or ''}"
-                    )
-                total_listed += len(listed)
-            else:
-                self.logger.info(f"✅ Clean on all {len(results)} blacklists")
-
-        self.logger.info(f"\n{'=' * 60}")
-        if total_listed > 0:
-            self.logger.warning(f"SUMMARY: Found {total_listed} listing(s)")
-            return 1
         else:
-            self.logger.info("SUMMARY: All targets clean!")
-            return 0
+            self.logger.info("✅ Clean on all %s blacklists", len(results))
+
+        return len(listed)
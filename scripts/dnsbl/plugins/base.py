@@ -5,12 +5,20 @@ Each plugin handles querying specific DNSBL services with their own
 query strategies (system DNS, direct authoritative NS, custom resolver, etc.)
 """
 
+import functools
+import ipaddress
 import logging
 import socket
+import zlib
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import ClassVar, Optional
+from typing import TYPE_CHECKING, ClassVar, Optional
+
+from ..cache import TTLCache
+
+if TYPE_CHECKING:
+    from dns.resolver import Resolver
 
 # Try to import dnspython
 try:
@@ -24,6 +32,17 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=8)
+def _reverse_ip(ip: str) -> str:
+    """Reverse IP address octets (memoized, one IP is checked against every zone).
+
+    IPv6 addresses are expanded to reversed nibbles, as in ip6.arpa.
+    """
+    if ":" in ip:
+        return ".".join(reversed(ipaddress.IPv6Address(ip).exploded.replace(":", "")))
+    return ".".join(ip.split(".")[::-1])
+
+
 @dataclass
 class DnsblResult:
     """Result of a DNSBL check."""
@@ -67,11 +86,38 @@ class DnsblPlugin(ABC):
 
     # Response codes that indicate false positive (e.g., public resolver block)
     # Override in subclasses
-    FALSE_POSITIVE_CODES: ClassVar[set[str]] = set()
+    FALSE_POSITIVE_CODES: ClassVar[frozenset[str]] = frozenset()
 
     # Shared NS cache across all plugin instances
     _ns_cache: ClassVar[dict[str, list[str]]] = {}
 
+    # Shared resolvers keyed by nameserver set
+    _resolver_cache: ClassVar[dict[tuple[str, ...], "Resolver"]] = {}
+
+    # Shared resolver for /etc/resolv.conf (None after loading = use libc)
+    _system_resolver: ClassVar[Optional["Resolver"]] = None
+    _system_resolver_loaded: ClassVar[bool] = False
+
+    # Custom recursive resolver(s) from config.dns_server (empty = unused)
+    custom_nameservers: ClassVar[list[str]] = []
+
+    # Shared lookup result cache: query -> return code (None = not listed)
+    result_cache: ClassVar[TTLCache[str, Optional[str]]] = TTLCache()
+
+    # Shared TXT reason cache: query -> reason ("" = none published)
+    reason_cache: ClassVar[TTLCache[str, str]] = TTLCache(maxsize=1024)
+
+    # Upper bound for cached answers, set by the checker to well under the
+    # check interval: every cycle must query afresh, the cache only saves
+    # repeated lookups within one cycle
+    cache_max_ttl: ClassVar[int] = 1800
+
+    # Floor for positive answers, so tiny record TTLs still skip a round trip
+    MIN_CACHE_TTL: ClassVar[int] = 60
+
+    # TTL for NXDOMAIN answers; SERVFAIL/timeouts are never cached
+    NEGATIVE_CACHE_TTL: ClassVar[int] = 60
+
     def __init__(self) -> None:
         self.logger = logging.getLogger(f"{__name__}.{self.name}")
 
@@ -128,68 +174,137 @@ class DnsblPlugin(ABC):
 
             if ns_ips:
                 self._ns_cache[zone] = ns_ips
-                self.logger.debug(f"Cached NS for {zone}: {ns_ips[:2]}...")
+                self.logger.debug("Cached NS for %s: %s...", zone, ns_ips[:2])
 
         except Exception as e:
-            self.logger.debug(f"Failed to get NS for {zone}: {e}")
+            self.logger.debug("Failed to get NS for %s: %s", zone, e)
 
         return ns_ips
 
-    def _direct_lookup(
-        self, query: str, zone: str, nameserver: str | None = None
-    ) -> Optional[str]:
-        """Query authoritative NS directly.
+    def _get_resolver(self, nameservers: list[str]) -> "Resolver":
+        """Get a shared resolver for a nameserver set.
+
+        Resolvers are built once per nameserver set instead of once per query,
+        and with configure=False so /etc/resolv.conf is never re-parsed.
+        """
+        key = tuple(nameservers)
+        resolver = self._resolver_cache.get(key)
+        if resolver is None:
+            resolver = dns.resolver.Resolver(configure=False)  # pyright: ignore[reportOptionalMemberAccess]
+            resolver.nameservers = list(key)
+            resolver.timeout = 5
+            resolver.lifetime = 10
+            self._resolver_cache[key] = resolver
+        return resolver
+
+    @classmethod
+    def _get_system_resolver(cls) -> Optional["Resolver"]:
+        """Get the shared resolver for the system nameservers.
+
+        Returns None when dnspython is missing or resolv.conf is unusable.
+        """
+        if not cls._system_resolver_loaded:
+            cls._system_resolver_loaded = True
+            if HAS_DNSPYTHON:
+                try:
+                    resolver = dns.resolver.Resolver()  # pyright: ignore[reportOptionalMemberAccess]
+                    resolver.timeout = 5
+                    resolver.lifetime = 10
+                    cls._system_resolver = resolver
+                except Exception as e:
+                    logger.warning("Cannot load system resolver config: %s", e)
+        return cls._system_resolver
+
+    def _get_zone_resolver(self, zone: str) -> "Resolver":
+        """Get the custom resolver for a zone, sharded across custom servers.
+
+        Each zone hashes to a primary server so upstream caches stay warm per
+        zone; the remaining servers follow in order as failover.
+        """
+        servers = self.custom_nameservers
+        i = zlib.crc32(zone.encode()) % len(servers)
+        return self._get_resolver(servers[i:] + servers[:i])
+
+    def _get_nameserver_ips(
+        self, zone: str, nameserver: str | None = None
+    ) -> list[str]:
+        """Get nameserver IPs for a direct query.
 
         Args:
-            query: DNS query (e.g., 67.231.199.138.zen.spamhaus.org)
             zone: DNSBL zone for NS lookup (e.g., zen.spamhaus.org)
             nameserver: Optional explicit nameserver hostname (e.g., a.gns.spamhaus.org)
         """
-        # Get nameserver IPs
         if nameserver:
             # Explicit nameserver provided - resolve it
             ns_ips = self._resolve_hostname(nameserver)
-            if not ns_ips:
-                self.logger.debug(
-                    f"Failed to resolve {nameserver}, falling back to zone NS"
-                )
-                ns_ips = self._get_authoritative_ns(zone)
-        else:
-            # Look up authoritative NS for zone
-            ns_ips = self._get_authoritative_ns(zone)
-
-        if not ns_ips:
-            self.logger.debug(f"No NS for {zone}, falling back to system")
-            return self._system_lookup(query)
+            if ns_ips:
+                return ns_ips
+            self.logger.debug(
+                "Failed to resolve %s, falling back to zone NS", nameserver
+            )
 
-        resolver = dns.resolver.Resolver()  # pyright: ignore[reportOptionalMemberAccess]
-        resolver.nameservers = ns_ips[:3]
-        resolver.timeout = 5
-        resolver.lifetime = 10
+        # Look up authoritative NS for zone
+        return self._get_authoritative_ns(zone)
 
+    def _select_resolver(
+        self, zone: str, direct_query: bool, nameserver: str | None = None
+    ) -> Optional["Resolver"]:
+        """Pick the resolver for a zone.
+
+        A configured custom DNS server takes precedence over direct queries,
+        which fall back to the system resolver when no NS is found. Returns
+        None without dnspython (callers then use libc).
+        """
+        if not HAS_DNSPYTHON:
+            return None
+        if self.custom_nameservers:
+            return self._get_zone_resolver(zone)
+        if direct_query:
+            ns_ips = self._get_nameserver_ips(zone, nameserver)
+            if ns_ips:
+                return self._get_resolver(ns_ips[:3])
+            self.logger.debug("No NS for %s, falling back to system", zone)
+        return self._get_system_resolver()
+
+    def _resolver_lookup(self, query: str, resolver: "Resolver") -> Optional[str]:
+        """Query via a dnspython resolver, caching the answer."""
         try:
             answers = resolver.resolve(query, "A")
-            return str(answers[0])  # pyright: ignore[reportUnknownArgumentType]
+            result = str(answers[0])  # pyright: ignore[reportUnknownArgumentType]
+            ttl = answers.rrset.ttl if answers.rrset else self.cache_max_ttl
+            self._cache_result(query, result, ttl)
+            return result
         except (
             dns.resolver.NXDOMAIN,  # pyright: ignore[reportOptionalMemberAccess]
             dns.resolver.NoAnswer,  # pyright: ignore[reportOptionalMemberAccess]
-            dns.resolver.NoNameservers,  # pyright: ignore[reportOptionalMemberAccess]
         ):
+            self._cache_result(query, None, self.NEGATIVE_CACHE_TTL)
+            return None
+        except dns.resolver.NoNameservers:  # pyright: ignore[reportOptionalMemberAccess]
             return None
         except Exception as e:
-            self.logger.debug(f"Direct lookup error for {query}: {e}")
+            self.logger.debug(
+                "Lookup error for %s via %s: %s", query, resolver.nameservers, e
+            )
             return None
 
     def _system_lookup(self, query: str) -> Optional[str]:
-        """Query using system DNS resolver."""
+        """Query using the libc resolver (fallback when dnspython is unusable)."""
         try:
-            return socket.gethostbyname(query)
-        except socket.gaierror:
+            result = socket.gethostbyname(query)
+        except socket.gaierror as e:
+            # Only a definite "no such name" is cacheable, not EAI_AGAIN etc.
+            if e.errno == socket.EAI_NONAME:
+                self._cache_result(query, None, self.NEGATIVE_CACHE_TTL)
             return None
         except socket.error as e:
-            self.logger.debug(f"Socket error for {query}: {e}")
+            self.logger.debug("Socket error for %s: %s", query, e)
             return None
 
+        # The system resolver does not expose TTLs
+        self._cache_result(query, result, self.cache_max_ttl)
+        return result
+
     def _lookup(
         self, query: str, zone: str, direct_query: bool, nameserver: str | None = None
     ) -> Optional[str]:
@@ -200,10 +315,25 @@ class DnsblPlugin(ABC):
             zone: DNSBL zone for NS lookup
             direct_query: Use authoritative NS instead of system DNS
             nameserver: Optional explicit nameserver hostname
+
+        See _select_resolver() for how the resolver is chosen.
         """
-        if direct_query and HAS_DNSPYTHON:
-            return self._direct_lookup(query, zone, nameserver)
-        return self._system_lookup(query)
+        hit, cached = self.result_cache.get(query)
+        if hit:
+            return cached
+
+        resolver = self._select_resolver(zone, direct_query, nameserver)
+        if resolver is None:
+            return self._system_lookup(query)
+        return self._resolver_lookup(query, resolver)
+
+    def _cache_result(self, query: str, result: Optional[str], ttl: int) -> None:
+        """Cache a lookup result, never beyond cache_max_ttl."""
+        self.result_cache.set(query, result, self._clamp_ttl(ttl))
+
+    def _clamp_ttl(self, ttl: int) -> int:
+        """Clamp a record TTL to [MIN_CACHE_TTL, cache_max_ttl]."""
+        return min(max(ttl, self.MIN_CACHE_TTL), self.cache_max_ttl)
 
     def _is_false_positive(self, return_code: str) -> bool:
         """Check if return code indicates false positive (e.g., resolver block)."""
@@ -215,20 +345,44 @@ class DnsblPlugin(ABC):
 
     def reverse_ip(self, ip: str) -> str:
         """Reverse IP address for DNSBL lookup."""
-        parts = ip.split(".")
-        return ".".join(reversed(parts))
+        return _reverse_ip(ip)
+
+    def get_txt_reason(
+        self,
+        query: str,
+        zone: str,
+        direct_query: bool = False,
+        nameserver: str | None = None,
+    ) -> str:
+        """Try to get listing reason from TXT record.
+
+        Uses the same resolver as the A lookup, so zones that refuse public
+        resolvers still answer, and caches the reason like A results.
+        """
+        hit, cached = self.reason_cache.get(query)
+        if hit:
+            return cached or ""
 
-    def get_txt_reason(self, query: str) -> str:
-        """Try to get listing reason from TXT record."""
-        if not HAS_DNSPYTHON:
+        resolver = self._select_resolver(zone, direct_query, nameserver)
+        if resolver is None:
             return ""
+
         try:
-            answers = dns.resolver.resolve(query, "TXT")  # pyright: ignore[reportOptionalMemberAccess]
-            reasons = [str(r).strip('"') for r in answers]
-            return "; ".join(reasons)
+            answers = resolver.resolve(query, "TXT")
+        except (
+            dns.resolver.NXDOMAIN,  # pyright: ignore[reportOptionalMemberAccess]
+            dns.resolver.NoAnswer,  # pyright: ignore[reportOptionalMemberAccess]
+        ):
+            self.reason_cache.set(query, "", self._clamp_ttl(self.NEGATIVE_CACHE_TTL))
+            return ""
         except Exception:
             return ""
 
+        reason = "; ".join(str(r).strip('"') for r in answers)  # pyright: ignore[reportUnknownArgumentType]
+        ttl = answers.rrset.ttl if answers.rrset else self.cache_max_ttl
+        self.reason_cache.set(query, reason, self._clamp_ttl(ttl))
+        return reason
+
     # ─────────────────────────────────────────────────────────────────
     # Check methods (can be overridden for custom behavior)
     # ─────────────────────────────────────────────────────────────────
@@ -257,7 +411,7 @@ class DnsblPlugin(ABC):
             dnsbl=dnsbl,
             listed=True,
             return_code=result,
-            reason=self.get_txt_reason(query),
+            reason=self.get_txt_reason(query, dnsbl, direct_query),
         )
 
     def check_domain(
@@ -289,5 +443,5 @@ class DnsblPlugin(ABC):
             dnsbl=dnsbl,
             listed=True,
             return_code=result,
-            reason=self.get_txt_reason(query),
+            reason=self.get_txt_reason(query, dnsbl, direct_query),
         )
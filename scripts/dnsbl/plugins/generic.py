@@ -64,13 +64,17 @@ class GenericDnsblPlugin(DnsblPlugin):
         # Default: any 127.x.x.x except false positives
         return return_code.startswith("127.")
 
-    def _get_reason(self, return_code: str, service: DnsblService, query: str) -> str:
+    def _get_reason(
+        self, return_code: str, service: DnsblService, query: str, direct_query: bool
+    ) -> str:
         """Get human-readable reason for listing."""
         # Check reason_map first
         if return_code in service.reason_map:
             return service.reason_map[return_code]
         # Try TXT record
-        txt_reason = self.get_txt_reason(query)
+        txt_reason = self.get_txt_reason(
+            query, service.zone, direct_query, service.nameserver
+        )
         if txt_reason:
             return txt_reason
         # Fallback
@@ -114,7 +118,7 @@ class GenericDnsblPlugin(DnsblPlugin):
             dnsbl=dnsbl,
             listed=True,
             return_code=result,
-            reason=self._get_reason(result, service, query),
+            reason=self._get_reason(result, service, query, direct_query),
         )
 
     def check_domain(
@@ -160,5 +164,5 @@ class GenericDnsblPlugin(DnsblPlugin):
             dnsbl=dnsbl,
             listed=True,
             return_code=result,
-            reason=self._get_reason(result, service, query),
+            reason=self._get_reason(result, service, query, direct_query),
         )
@@ -61,18 +61,23 @@ class DnsblRegistry:
                         plugin = attr()
                         self._plugins.append(plugin)
                         self.logger.debug(
-                            f"Loaded plugin: {plugin.name} (priority={plugin.priority})"
+                            "Loaded plugin: %s (priority=%s)",
+                            plugin.name,
+                            plugin.priority,
                         )
 
             except Exception as e:
-                self.logger.warning(f"Failed to load plugin module {module_name}: {e}")
+                self.logger.warning(
+                    "Failed to load plugin module %s: %s", module_name, e
+                )
 
         # Sort plugins by priority (highest first)
         self._plugins.sort(key=lambda p: p.priority, reverse=True)
 
         self.logger.info(
-            f"Loaded {len(self._plugins)} DNSBL plugins: "
-            f"{', '.join(p.name for p in self._plugins)}"
+            "Loaded %s DNSBL plugins: %s",
+            len(self._plugins),
+            ", ".join(p.name for p in self._plugins),
         )
 
     def get_plugin(self, dnsbl: str) -> Optional[DnsblPlugin]:
@@ -112,7 +117,7 @@ class DnsblRegistry:
         plugin = self.get_plugin(dnsbl)
 
         if plugin is None:
-            self.logger.warning(f"No plugin found for DNSBL: {dnsbl}")
+            self.logger.warning("No plugin found for DNSBL: %s", dnsbl)
             return DnsblResult(
                 target=ip,
                 target_type="ip",
@@ -125,7 +130,7 @@ class DnsblRegistry:
             return plugin.check_ip(ip, dnsbl, direct_query=direct_query)
         except Exception as e:
             self.logger.error(
-                f"Plugin {plugin.name} failed checking {ip} @ {dnsbl}: {e}"
+                "Plugin %s failed checking %s @ %s: %s", plugin.name, ip, dnsbl, e
             )
             return DnsblResult(
                 target=ip,
@@ -152,7 +157,7 @@ class DnsblRegistry:
         plugin = self.get_plugin(dnsbl)
 
         if plugin is None:
-            self.logger.warning(f"No plugin found for DNSBL: {dnsbl}")
+            self.logger.warning("No plugin found for DNSBL: %s", dnsbl)
             return DnsblResult(
                 target=domain,
                 target_type="domain",
@@ -165,7 +170,7 @@ class DnsblRegistry:
             return plugin.check_domain(domain, dnsbl, direct_query=direct_query)
         except Exception as e:
             self.logger.error(
-                f"Plugin {plugin.name} failed checking {domain} @ {dnsbl}: {e}"
+                "Plugin %s failed checking %s @ %s: %s", plugin.name, domain, dnsbl, e
             )
             return DnsblResult(
                 target=domain,
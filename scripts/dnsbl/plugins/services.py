@@ -21,8 +21,8 @@ class DnsblService:
     zone: str
     type: str = "ip"  # "ip" or "domain"
     nameserver: str | None = None  # Direct query NS (None = system DNS)
-    false_positives: set[str] = field(default_factory=set)
-    valid_codes: set[str] | None = None  # None = any 127.x.x.x is valid
+    false_positives: frozenset[str] = frozenset()
+    valid_codes: frozenset[str] | None = None  # None = any 127.x.x.x is valid
     reason_map: dict[str, str] = field(default_factory=dict)
 
 
@@ -37,7 +37,7 @@ IP_SERVICES: list[DnsblService] = [
     DnsblService(
         zone="zen.spamhaus.org",
         nameserver="a.gns.spamhaus.org",
-        false_positives={"127.255.255.254", "127.255.255.255"},
+        false_positives=frozenset({"127.255.255.254", "127.255.255.255"}),
         reason_map={
             "127.0.0.2": "SBL (direct spam source)",
             "127.0.0.3": "CSS (spam operations)",
@@ -55,7 +55,7 @@ IP_SERVICES: list[DnsblService] = [
     # ─────────────────────────────────────────────────────────────────────────
     DnsblService(
         zone="bl.spamcop.net",
-        valid_codes={"127.0.0.2"},
+        valid_codes=frozenset({"127.0.0.2"}),
         reason_map={"127.0.0.2": "SpamCop reported"},
     ),
     # ─────────────────────────────────────────────────────────────────────────
@@ -63,7 +63,7 @@ IP_SERVICES: list[DnsblService] = [
     # ─────────────────────────────────────────────────────────────────────────
     DnsblService(
         zone="b.barracudacentral.org",
-        valid_codes={"127.0.0.2"},
+        valid_codes=frozenset({"127.0.0.2"}),
         reason_map={"127.0.0.2": "Barracuda RBL"},
     ),
     # ─────────────────────────────────────────────────────────────────────────
@@ -140,7 +140,7 @@ IP_SERVICES: list[DnsblService] = [
             "127.0.0.4": "Brown (unknown)",
             "127.0.0.5": "No reverse DNS",
         },
-        false_positives={"127.0.0.1"},  # White = not listed
+        false_positives=frozenset({"127.0.0.1"}),  # White = not listed
     ),
     DnsblService(zone="dnsbl.inps.de"),
     DnsblService(zone="icm.your-freedom.de"),
@@ -179,7 +179,7 @@ DOMAIN_SERVICES: list[DnsblService] = [
         zone="dbl.spamhaus.org",
         type="domain",
         nameserver="a.gns.spamhaus.org",
-        false_positives={"127.255.255.254", "127.255.255.255"},
+        false_positives=frozenset({"127.255.255.254", "127.255.255.255"}),
         reason_map={
             "127.0.1.2": "Spam domain",
             "127.0.1.4": "Phishing domain",
@@ -199,7 +199,7 @@ DOMAIN_SERVICES: list[DnsblService] = [
         zone="multi.uribl.com",
         type="domain",
         nameserver="v.uribl.net",
-        false_positives={"127.0.0.1"},  # Test/blocked response
+        false_positives=frozenset({"127.0.0.1"}),  # Test/blocked response
         reason_map={
             "127.0.0.2": "URIBL black",
             "127.0.0.4": "URIBL grey",
@@ -213,7 +213,7 @@ DOMAIN_SERVICES: list[DnsblService] = [
         zone="multi.surbl.org",
         type="domain",
         nameserver="green.surbl.org",
-        false_positives={"127.0.0.254"},  # Blocked response
+        false_positives=frozenset({"127.0.0.254"}),  # Blocked response
         reason_map={
             "127.0.0.2": "SC (SpamCop)",
             "127.0.0.4": "WS (sa-blacklist)",
@@ -252,6 +252,12 @@ def get_service(zone: str) -> DnsblService | None:
     return _SERVICE_MAP.get(zone)
 
 
+def needs_direct_query(zone: str) -> bool:
+    """Check if a zone blocks public resolvers (has a direct query NS)."""
+    service = _SERVICE_MAP.get(zone)
+    return service is not None and service.nameserver is not None
+
+
 def get_all_ip_zones() -> list[str]:
     """Get all IP blacklist zones."""
     return [s.zone for s in IP_SERVICES]
@@ -22,9 +22,6 @@ import sys
 from pathlib import Path
 from typing import Optional
 
-# Setup path for local imports
-sys.path.insert(0, str(Path(__file__).parent))
-
 from utils.k8s import KubernetesClient, KubernetesConfig
 
 logging.basicConfig(
@@ -1,5 +1,6 @@
 # Utility modules
+from .files import write_atomic
 from .ip import IPDetector, detect_ip
 from .k8s import KubernetesClient
 
-__all__ = ["detect_ip", "IPDetector", "KubernetesClient"]
+__all__ = ["detect_ip", "IPDetector", "KubernetesClient", "write_atomic"]
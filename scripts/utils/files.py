@@ -0,0 +1,21 @@
+"""
+File Utilities
+
+Helpers for state files shared between containers via the shared volume.
+"""
+
+import os
+from pathlib import Path
+
+
+def write_atomic(path: Path, data: str) -> None:
+    """
+    Replace a file's contents atomically.
+
+    Data is written to a temporary file next to the target and renamed over
+    it, so readers in other containers see the old or the new contents,
+    never a partial write.
+    """
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(data)
+    os.replace(tmp, path)
@@ -89,6 +89,11 @@ class IPDetector:
         self.config = config or IPDetectorConfig()
         self.logger = logging.getLogger(__name__)
 
+        # Kept-alive connections to the IP APIs; the DNS watcher asks them
+        # on every check
+        self._session = requests.Session()
+        self._session.headers["User-Agent"] = "mail-relay-dns-manager"
+
     def detect_outbound_ip(self) -> Optional[str]:
         """Detect outbound IP via external API"""
         if not self.config.detect_outbound:
@@ -96,11 +101,7 @@ class IPDetector:
 
         for api_url in self.config.external_apis or []:
             try:
-                response = requests.get(
-                    api_url,
-                    timeout=self.config.timeout,
-                    headers={"User-Agent": "mail-relay-dns-manager"},
-                )
+                response = self._session.get(api_url, timeout=self.config.timeout)
 
                 if response.status_code == 200:
                     ip = response.text.strip()